@@ -0,0 +1,111 @@
+"""
+Per-phase instrumentation for audits.
+
+AuditStats records wall time, call counts and (optionally, via tracemalloc)
+peak memory for each (phase, document) pair. Phases used by the engine:
+
+    parse        whole parse_document_sections call (cache hits included)
+    toc          Step A, TOC table lookup
+    scan         Step B, block scan + sectioning
+    fuzzy_match  title similarity scoring inside the scan
+    report       generate_html_report
+
+Stats objects are plain picklable data, so worker processes return theirs and
+the parent merges them. profiled() wraps a block in cProfile and dumps a
+.pstats file for `python -m pstats` / snakeviz.
+"""
+import contextlib
+import cProfile
+import time
+import tracemalloc
+
+class AuditStats:
+    def __init__(self, track_memory=False):
+        self.track_memory = track_memory
+        # (phase, document) -> {'calls': int, 'wall': float seconds, 'peak_bytes': int or None}
+        self.phases = {}
+        self._open_peaks = []
+
+    def add(self, phase, document=None, wall=0.0, calls=1, peak_bytes=None):
+        entry = self.phases.get((phase, document))
+        if entry is None:
+            entry = {'calls': 0, 'wall': 0.0, 'peak_bytes': None}
+            self.phases[(phase, document)] = entry
+        entry['calls'] += calls
+        entry['wall'] += wall
+        if peak_bytes is not None:
+            entry['peak_bytes'] = max(entry['peak_bytes'] or 0, peak_bytes)
+
+    @contextlib.contextmanager
+    def phase(self, phase, document=None):
+        """Time the enclosed block (and its peak traced memory when track_memory is on)."""
+        tracking = self.track_memory
+        if tracking:
+            started_tracing = not tracemalloc.is_tracing()
+            if started_tracing:
+                tracemalloc.start()
+            # Each open phase keeps its own peak on the stack. Starting a phase folds the
+            # enclosing phase's peak so far into its entry before the tracemalloc peak is reset.
+            if self._open_peaks:
+                self._open_peaks[-1] = max(self._open_peaks[-1], tracemalloc.get_traced_memory()[1])
+            self._open_peaks.append(0)
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            wall = time.perf_counter() - start
+            peak = None
+            if tracking:
+                # Peak since the last reset, combined with what nested phases left on our entry
+                peak = max(tracemalloc.get_traced_memory()[1], self._open_peaks.pop())
+                if self._open_peaks:
+                    self._open_peaks[-1] = max(self._open_peaks[-1], peak)
+                if started_tracing:
+                    tracemalloc.stop()
+            self.add(phase, document, wall, 1, peak)
+
+    def merge(self, other):
+        """Fold another AuditStats (e.g. from a worker process) into this one."""
+        if other is None:
+            return self
+        for (phase, document), entry in other.phases.items():
+            self.add(phase, document, entry['wall'], entry['calls'], entry['peak_bytes'])
+        return self
+
+    def to_dict(self):
+        return [
+            {'phase': phase, 'document': document, **entry}
+            for (phase, document), entry in self.phases.items()
+        ]
+
+    def format_table(self):
+        """Human-readable lines, one per (phase, document)."""
+        lines = [f"{'Phase':<12} {'Document':<32} {'Calls':>7} {'Wall (s)':>9} {'Peak (MB)':>10}"]
+        for (phase, document), entry in self.phases.items():
+            peak = entry['peak_bytes']
+            peak_text = f"{peak / (1024 * 1024):.1f}" if peak is not None else "-"
+            lines.append(
+                f"{phase:<12} {str(document or '-'):<32.32} {entry['calls']:>7} {entry['wall']:>9.3f} {peak_text:>10}"
+            )
+        return lines
+
+def measure(stats, phase, document=None):
+    """stats.phase(...) when instrumentation is on, otherwise a no-op context."""
+    if stats is None:
+        return contextlib.nullcontext()
+    return stats.phase(phase, document)
+
+@contextlib.contextmanager
+def profiled(profile_path):
+    """Run the enclosed block under cProfile and dump the stats to profile_path (no-op if None)."""
+    if not profile_path:
+        yield None
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        profiler.dump_stats(profile_path)
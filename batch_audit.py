@@ -0,0 +1,257 @@
+"""
+Batch audit over many Chinese/English document pairs.
+
+Pairs come either from a folder convention (<name>_chi.docx + <name>_eng.docx)
+or from a manifest (.csv with name,chi,eng columns or .json list of the same
+objects; relative paths are resolved against the manifest's folder). Pairs are
+fanned out across a process pool; each worker runs the same
+parse_document_sections / generate_html_report calls as the GUI, so reports
+are identical. One report is written per pair, plus index.html and
+summary.json with per-pair timing.
+
+Usage:
+    python batch_audit.py <folder> [--manifest pairs.csv] [--output-dir DIR] [--workers N]
+"""
+import argparse
+import csv
+import html
+import json
+import multiprocessing
+import os
+import re
+import sys
+import time
+
+from check_docx_engine import (
+    CHI_TITLE_PATTERN, CHI_TOC_KEYWORD, ENG_TITLE_PATTERN, ENG_TOC_KEYWORD, PARSE_BACKENDS,
+    generate_html_report, parse_document_sections,
+)
+
+CHI_SUFFIX = "_chi.docx"
+ENG_SUFFIX = "_eng.docx"
+
+# Characters that can't appear in a report file name (path separators included)
+_UNSAFE_NAME_RE = re.compile(r'[\\/:*?"<>|\x00-\x1f]+')
+
+# ==========================================
+# 1. Pair Discovery
+# ==========================================
+
+def discover_pairs(folder, log_func=print):
+    """Returns [{'name':..., 'chi':..., 'eng':...}] for every <name>_chi.docx with a matching _eng file."""
+    pairs = []
+    names = sorted(os.listdir(folder))
+    for filename in names:
+        if not filename.lower().endswith(CHI_SUFFIX) or filename.startswith("~$"):
+            continue
+        name = filename[:-len(CHI_SUFFIX)]
+        eng_name = name + ENG_SUFFIX
+        matches = [n for n in names if n.lower() == eng_name.lower()]
+        if not matches:
+            log_func(f"Warning: No English file for {filename} (expected {eng_name}), skipped.")
+            continue
+        pairs.append({
+            'name': name,
+            'chi': os.path.join(folder, filename),
+            'eng': os.path.join(folder, matches[0]),
+        })
+    return pairs
+
+def load_manifest(manifest_path):
+    """Reads a .csv (name,chi,eng header) or .json manifest into the same pair dicts."""
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    if manifest_path.lower().endswith(".json"):
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            rows = json.load(f)
+    else:
+        with open(manifest_path, "r", encoding="utf-8-sig", newline="") as f:
+            rows = list(csv.DictReader(f))
+
+    pairs = []
+    for i, row in enumerate(rows):
+        chi = os.path.join(base_dir, row['chi'])
+        eng = os.path.join(base_dir, row['eng'])
+        name = row.get('name') or os.path.splitext(os.path.basename(chi))[0] or f"pair_{i + 1}"
+        pairs.append({'name': name, 'chi': chi, 'eng': eng})
+    return pairs
+
+def unique_pair_names(pairs):
+    """
+    Make every pair's name usable as a report file name inside output_dir: path
+    separators and other unsafe characters become "_", leading dots are dropped
+    (no ".." escapes), and repeated names get a _2, _3, ... suffix. Returns new dicts.
+    """
+    used = set()
+    result = []
+    for i, pair in enumerate(pairs):
+        base = _UNSAFE_NAME_RE.sub("_", str(pair['name'])).strip().lstrip(".") or f"pair_{i + 1}"
+        name, n = base, 1
+        while name.lower() in used:  # Case-insensitive file systems
+            n += 1
+            name = f"{base}_{n}"
+        used.add(name.lower())
+        result.append(dict(pair, name=name))
+    return result
+
+# ==========================================
+# 2. Per-pair Worker
+# ==========================================
+
+def audit_pair(pair, output_dir, options, index=0):
+    """Parse both documents and write the pair's report. Runs inside a pool worker."""
+    logs = []
+    result = {
+        'index': index,
+        'name': pair['name'],
+        'chi': pair['chi'],
+        'eng': pair['eng'],
+        'report': None,
+        'status': 'failed',
+        'timing': {},
+        'logs': logs,
+    }
+    started = time.perf_counter()
+    try:
+        t0 = time.perf_counter()
+        sections_chi = parse_document_sections(
+            pair['chi'], options['chi_toc_keyword'], options['chi_pattern'], logs.append, options['backend'])
+        t1 = time.perf_counter()
+        sections_eng = parse_document_sections(
+            pair['eng'], options['eng_toc_keyword'], options['eng_pattern'], logs.append, options['backend'])
+        t2 = time.perf_counter()
+
+        result['sections_chi'] = len(sections_chi)
+        result['sections_eng'] = len(sections_eng)
+        result['timing'].update(parse_chi=t1 - t0, parse_eng=t2 - t1)
+        if sections_chi and sections_eng:
+            report_path = os.path.join(output_dir, f"{pair['name']}_report.html")
+            generate_html_report(sections_chi, sections_eng, report_path)
+            result['timing']['report'] = time.perf_counter() - t2
+            result['report'] = report_path
+            result['status'] = 'ok'
+    except Exception as e:
+        logs.append(f"Error: {e}")
+    result['timing']['total'] = time.perf_counter() - started
+    return result
+
+def _audit_pair_job(args):
+    return audit_pair(*args)
+
+# ==========================================
+# 3. Batch Runner & Summary
+# ==========================================
+
+def default_options(backend="docx"):
+    return {
+        'chi_toc_keyword': CHI_TOC_KEYWORD,
+        'chi_pattern': CHI_TITLE_PATTERN,
+        'eng_toc_keyword': ENG_TOC_KEYWORD,
+        'eng_pattern': ENG_TITLE_PATTERN,
+        'backend': backend,
+    }
+
+def run_batch(pairs, output_dir, workers=None, options=None, log_func=print):
+    """Audit all pairs across a process pool; returns results in input order and writes the summary index."""
+    options = options or default_options()
+    workers = workers or os.cpu_count() or 1
+    os.makedirs(output_dir, exist_ok=True)
+
+    pairs = unique_pair_names(pairs)
+    jobs = [(pair, output_dir, options, i) for i, pair in enumerate(pairs)]
+    results = []
+    started = time.perf_counter()
+    if workers > 1 and len(jobs) > 1:
+        with multiprocessing.get_context("spawn").Pool(processes=min(workers, len(jobs))) as pool:
+            for result in pool.imap_unordered(_audit_pair_job, jobs):
+                _log_result(result, log_func)
+                results.append(result)
+    else:
+        for job in jobs:
+            result = _audit_pair_job(job)
+            _log_result(result, log_func)
+            results.append(result)
+    elapsed = time.perf_counter() - started
+
+    results.sort(key=lambda r: r['index'])
+    write_summary(results, output_dir, elapsed)
+    log_func(f">>> Batch finished: {sum(r['status'] == 'ok' for r in results)}/{len(results)} pairs in {elapsed:.2f}s")
+    return results
+
+def _log_result(result, log_func):
+    for line in result['logs']:
+        if line.startswith(("Error", "Warning")):
+            log_func(f"[{result['name']}] {line}")
+    status = "OK" if result['status'] == 'ok' else "FAILED"
+    log_func(f"[{result['name']}] {status} in {result['timing'].get('total', 0):.2f}s")
+
+def write_summary(results, output_dir, elapsed):
+    summary = {
+        'elapsed': elapsed,
+        'pairs': [{k: v for k, v in r.items() if k not in ('logs', 'index')} for r in results],
+    }
+    with open(os.path.join(output_dir, "summary.json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+
+    rows = []
+    for i, r in enumerate(results, 1):
+        timing = r['timing']
+        report_cell = (
+            f'<a href="{html.escape(os.path.basename(r["report"]))}">report</a>' if r['report'] else "-"
+        )
+        rows.append(
+            f'<tr class="{r["status"]}"><td>{i}</td><td>{html.escape(r["name"])}</td>'
+            f'<td>{r["status"]}</td><td>{r.get("sections_chi", "-")} / {r.get("sections_eng", "-")}</td>'
+            f'<td>{timing.get("parse_chi", 0):.2f}</td><td>{timing.get("parse_eng", 0):.2f}</td>'
+            f'<td>{timing.get("report", 0):.2f}</td><td>{timing.get("total", 0):.2f}</td>'
+            f'<td>{report_cell}</td></tr>'
+        )
+
+    with open(os.path.join(output_dir, "index.html"), "w", encoding="utf-8") as f:
+        f.write(f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<title>Batch Audit Summary</title>
+<style>
+    body{{font-family:"Microsoft JhengHei",Arial,sans-serif;background-color:#f4f4f9;margin:40px}}
+    h1{{text-align:center;color:#333}}
+    table{{width:100%;border-collapse:collapse;background:#fff}}
+    th,td{{border:1px solid #e0e0e0;padding:8px;text-align:left}}
+    thead th{{background-color:#3498db;color:#fff}}
+    tr.failed td{{background-color:#fdecea}}
+</style>
+</head>
+<body>
+<h1>Batch Audit Summary</h1>
+<p>{len(results)} pairs, total wall time {elapsed:.2f}s</p>
+<table>
+<thead><tr><th>#</th><th>Pair</th><th>Status</th><th>Sections (CH / EN)</th><th>Parse CH (s)</th><th>Parse EN (s)</th><th>Report (s)</th><th>Total (s)</th><th>Report</th></tr></thead>
+<tbody>
+{"".join(rows)}
+</tbody>
+</table>
+</body></html>
+""")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Audit every Chinese/English .docx pair in a folder.")
+    parser.add_argument("folder", nargs="?", default=".", help=f"folder with <name>{CHI_SUFFIX} / <name>{ENG_SUFFIX} pairs")
+    parser.add_argument("--manifest", help="CSV (name,chi,eng) or JSON list of pairs, used instead of the folder convention")
+    parser.add_argument("--output-dir", help="where reports are written (default: <folder>/audit_reports)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--backend", choices=PARSE_BACKENDS, default="docx", help="document parsing backend")
+    args = parser.parse_args(argv)
+
+    pairs = load_manifest(args.manifest) if args.manifest else discover_pairs(args.folder)
+    if not pairs:
+        print("Error: No document pairs found.")
+        return 1
+
+    output_dir = args.output_dir or os.path.join(args.folder, "audit_reports")
+    results = run_batch(pairs, output_dir, args.workers, default_options(args.backend))
+    print(f"Summary: {os.path.join(output_dir, 'index.html')}")
+    return 0 if all(r['status'] == 'ok' for r in results) else 1
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
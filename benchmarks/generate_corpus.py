@@ -0,0 +1,115 @@
+"""
+Synthetic bilingual .docx corpus for benchmarks.
+
+generate_pair() writes a <name>_chi.docx / <name>_eng.docx pair whose structure
+mirrors a tender pack: an optional TOC table (頁碼 / Page header), then for each
+section a title paragraph, body paragraphs made of several runs with a given
+bold/underline density, and data tables. Output is deterministic for a seed.
+
+Usage:
+    python benchmarks/generate_corpus.py OUT_DIR --sections 20 --paragraphs 50 ...
+"""
+import argparse
+import os
+import random
+
+from docx import Document
+
+CHI_ORDINALS = "甲乙丙丁戊己庚辛壬癸"
+CHI_CHARS = "本合約條款之規定承判商應於工程期間內按照圖則及規格完成所有工程並須負責保養維修費用款項"
+ENG_WORDS = (
+    "the contractor shall complete all works in accordance with drawings and specification "
+    "during maintenance period including payment of any sum due under this contract clause"
+).split()
+
+DEFAULT_CONFIG = {
+    'sections': 10,
+    'paragraphs': 30,        # body paragraphs per section
+    'tables': 2,             # tables per section
+    'table_rows': 5,
+    'table_cols': 3,
+    'runs': 6,               # runs per paragraph
+    'bold_density': 0.2,     # probability that a run is bold
+    'underline_density': 0.1,
+    'toc': True,
+    'seed': 0,
+}
+
+def section_titles(count):
+    chi, eng = [], []
+    for i in range(count):
+        ordinal = CHI_ORDINALS[i] if i < len(CHI_ORDINALS) else f"（{i + 1}）"
+        chi.append(f"{ordinal}部：第{i + 1}部分 合約條款")
+        letter = chr(ord("A") + i) if i < 26 else str(i + 1)
+        eng.append(f"Part {letter}: Conditions of Contract {i + 1}")
+    return chi, eng
+
+def _chi_text(rnd, length):
+    return "".join(rnd.choice(CHI_CHARS) for _ in range(length)) + f"{rnd.randint(1, 99999):,}元"
+
+def _eng_text(rnd, length):
+    return " ".join(rnd.choice(ENG_WORDS) for _ in range(length)) + f" HK${rnd.randint(1, 99999):,} "
+
+def build_document(path, titles, toc_keyword, make_text, config):
+    rnd = random.Random(config['seed'])
+    doc = Document()
+    doc.add_paragraph("Tender Document")
+
+    if config['toc']:
+        table = doc.add_table(rows=len(titles) + 1, cols=2)
+        table.rows[0].cells[0].text = "Contents"
+        table.rows[0].cells[1].text = toc_keyword
+        for i, title in enumerate(titles):
+            table.rows[i + 1].cells[0].text = title
+            table.rows[i + 1].cells[1].text = str(i * 10 + 3)
+
+    for title in titles:
+        doc.add_paragraph(title)
+        table_every = max(1, config['paragraphs'] // (config['tables'] + 1)) if config['tables'] else 0
+        tables_left = config['tables']
+        for p_idx in range(config['paragraphs']):
+            para = doc.add_paragraph()
+            for _ in range(config['runs']):
+                run = para.add_run(make_text(rnd, rnd.randint(3, 8)))
+                x = rnd.random()
+                if x < config['bold_density']:
+                    run.bold = True
+                elif x < config['bold_density'] + config['underline_density']:
+                    run.underline = True
+            if tables_left and table_every and (p_idx + 1) % table_every == 0:
+                tables_left -= 1
+                table = doc.add_table(rows=config['table_rows'], cols=config['table_cols'])
+                for row in table.rows:
+                    for cell in row.cells:
+                        cell.text = make_text(rnd, 3)
+                        if rnd.random() < config['bold_density']:
+                            cell.paragraphs[0].runs[0].bold = True
+    doc.save(path)
+
+def generate_pair(output_dir, name="bench", **overrides):
+    """Write <name>_chi.docx and <name>_eng.docx; returns their paths."""
+    config = dict(DEFAULT_CONFIG, **overrides)
+    os.makedirs(output_dir, exist_ok=True)
+    chi_titles, eng_titles = section_titles(config['sections'])
+    chi_path = os.path.join(output_dir, f"{name}_chi.docx")
+    eng_path = os.path.join(output_dir, f"{name}_eng.docx")
+    build_document(chi_path, chi_titles, "頁碼", _chi_text, config)
+    build_document(eng_path, eng_titles, "Page", _eng_text, dict(config, seed=config['seed'] + 1))
+    return chi_path, eng_path
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic bilingual .docx pair.")
+    parser.add_argument("output_dir")
+    parser.add_argument("--name", default="bench")
+    for key, value in DEFAULT_CONFIG.items():
+        if isinstance(value, bool):
+            parser.add_argument(f"--no-{key}", dest=key, action="store_false", help=f"omit the {key}")
+        else:
+            parser.add_argument(f"--{key.replace('_', '-')}", dest=key, type=type(value), default=value)
+    args = vars(parser.parse_args(argv))
+    output_dir, name = args.pop("output_dir"), args.pop("name")
+    for path in generate_pair(output_dir, name, **args):
+        print(path)
+
+if __name__ == "__main__":
+    main()
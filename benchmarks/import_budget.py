@@ -0,0 +1,73 @@
+"""
+Cold-start import check: the engine and the GUI module must import quickly and
+without pulling in the heavy parse dependencies, which load on first use.
+
+Each target is imported in a fresh interpreter several times; the median import
+time is compared with its budget and the modules it loaded are checked against
+the forbidden list. Exits with status 1 when any check fails, so it can gate CI.
+
+Usage:
+    python benchmarks/import_budget.py --repeat 5 --scale 2.0
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that only a parse / report may import
+HEAVY_MODULES = ("docx", "lxml", "rapidfuzz", "pandas")
+
+# (module, budget in seconds, modules that must not be loaded by importing it)
+TARGETS = (
+    ("check_docx_engine", 0.10, HEAVY_MODULES),
+    ("main_gui", 0.40, HEAVY_MODULES + ("check_docx_engine",)),
+)
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'loaded': [m for m in {forbidden!r} if m in sys.modules]}}))
+"""
+
+def probe(module, forbidden):
+    """Import module in a fresh interpreter; returns (seconds, forbidden modules it loaded)."""
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(module=module, forbidden=tuple(forbidden))],
+        cwd=REPO_DIR, capture_output=True, text=True, check=True,
+    )
+    data = json.loads(result.stdout.strip().splitlines()[-1])
+    return data['seconds'], data['loaded']
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check cold import time and lazy-loading of heavy dependencies.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every budget (slow CI machines)")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for module, budget, forbidden in TARGETS:
+        try:
+            samples, loaded = [], []
+            for _ in range(args.repeat):
+                seconds, loaded = probe(module, forbidden)
+                samples.append(seconds)
+        except subprocess.CalledProcessError as e:
+            print(f"FAIL {module}: import failed\n{e.stderr}")
+            failed = True
+            continue
+        median = statistics.median(samples)
+        limit = budget * args.scale
+        ok = median <= limit and not loaded
+        failed |= not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {module}: {median * 1000:.0f} ms (budget {limit * 1000:.0f} ms)"
+              + (f", loaded {', '.join(loaded)}" if loaded else ""))
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
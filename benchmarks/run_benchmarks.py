@@ -0,0 +1,160 @@
+"""
+Benchmark the audit pipeline on synthetic corpora and emit machine-readable JSON.
+
+For each size preset a bilingual pair is generated (once, cached in the corpus
+folder) and every stage is timed over several repeats: parsing each document
+with each backend (with the toc/scan breakdown from AuditStats), section and
+item alignment, and report generation (which includes alignment again). Results carry the git commit so runs can be compared across commits.
+
+Usage:
+    python benchmarks/run_benchmarks.py --sizes small,medium --repeat 3 -o bench.json
+"""
+import argparse
+import hashlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from generate_corpus import DEFAULT_CONFIG, generate_pair  # noqa: E402
+
+from audit_stats import AuditStats  # noqa: E402
+from docx_align import ALIGN_MATCH, align_items, align_sections  # noqa: E402
+from check_docx_engine import (  # noqa: E402
+    CHI_TITLE_PATTERN, CHI_TOC_KEYWORD, ENG_TITLE_PATTERN, ENG_TOC_KEYWORD, PARSE_BACKENDS,
+    generate_html_report, parse_document_sections,
+)
+
+SIZE_PRESETS = {
+    'small': {'sections': 5, 'paragraphs': 20},
+    'medium': {'sections': 20, 'paragraphs': 60},
+    'large': {'sections': 40, 'paragraphs': 150, 'tables': 4},
+    'no_toc': {'sections': 10, 'paragraphs': 60, 'toc': False},
+}
+
+def corpus_pair(corpus_dir, preset):
+    config = dict(DEFAULT_CONFIG, **SIZE_PRESETS[preset])
+    digest = hashlib.sha1(json.dumps(config, sort_keys=True).encode("utf-8")).hexdigest()[:10]
+    name = f"{preset}_{digest}"
+    chi_path = os.path.join(corpus_dir, f"{name}_chi.docx")
+    eng_path = os.path.join(corpus_dir, f"{name}_eng.docx")
+    if not (os.path.exists(chi_path) and os.path.exists(eng_path)):
+        generate_pair(corpus_dir, name, **config)
+    return config, chi_path, eng_path
+
+def _summarize(samples):
+    return {
+        'min': min(samples),
+        'median': statistics.median(samples),
+        'max': max(samples),
+        'samples': samples,
+    }
+
+def bench_preset(preset, corpus_dir, backends, repeat):
+    config, chi_path, eng_path = corpus_pair(corpus_dir, preset)
+    result = {
+        'preset': preset,
+        'config': config,
+        'bytes': {'chi': os.path.getsize(chi_path), 'eng': os.path.getsize(eng_path)},
+        'stages': {},
+    }
+    quiet = lambda msg: None
+    docs = (
+        ('chi', chi_path, CHI_TOC_KEYWORD, CHI_TITLE_PATTERN),
+        ('eng', eng_path, ENG_TOC_KEYWORD, ENG_TITLE_PATTERN),
+    )
+
+    sections = {}
+    for backend in backends:
+        for side, path, keyword, pattern in docs:
+            walls = {}
+            for _ in range(repeat):
+                stats = AuditStats()
+                sections[side] = parse_document_sections(
+                    path, keyword, pattern, quiet, backend=backend, stats=stats)
+                for (phase, _doc), entry in stats.phases.items():
+                    walls.setdefault(phase, []).append(entry['wall'])
+            result['stages'][f"parse_{side}[{backend}]"] = {
+                phase: _summarize(samples) for phase, samples in walls.items()
+            }
+    result['counts'] = {
+        side: {
+            'sections': len(secs),
+            'items': sum(len(items) for sec in secs for items in sec.formatted_data.values()),
+        }
+        for side, secs in sections.items()
+    }
+
+    align_samples = {'align_sections': [], 'align_items': []}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        section_rows = align_sections(sections['chi'], sections['eng'])
+        middle = time.perf_counter()
+        for kind, sec_c, sec_e in section_rows:
+            if kind == ALIGN_MATCH:
+                for name in sec_c.formatted_data:
+                    align_items(sec_c.formatted_data[name], sec_e.formatted_data.get(name, []))
+        end = time.perf_counter()
+        align_samples['align_sections'].append(middle - start)
+        align_samples['align_items'].append(end - middle)
+    result['stages']['align'] = {phase: _summarize(samples) for phase, samples in align_samples.items()}
+
+    report_samples = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            generate_html_report(sections['chi'], sections['eng'], os.path.join(tmp, "report.html"))
+            report_samples.append(time.perf_counter() - start)
+    result['stages']['report'] = {'report': _summarize(report_samples)}
+    return result
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=REPO_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark parse / report stages on synthetic .docx pairs.")
+    parser.add_argument("--sizes", default="small,medium", help=f"comma-separated presets: {','.join(SIZE_PRESETS)}")
+    parser.add_argument("--backends", default=",".join(PARSE_BACKENDS), help="comma-separated parse backends")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--corpus-dir", default=os.path.join(tempfile.gettempdir(), "docx-auditor-bench"))
+    parser.add_argument("-o", "--output", default=None, help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    presets = [p for p in args.sizes.split(",") if p]
+    unknown = [p for p in presets if p not in SIZE_PRESETS]
+    if unknown:
+        parser.error(f"unknown size preset(s): {', '.join(unknown)}")
+
+    report = {
+        'commit': git_commit(),
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'results': [
+            bench_preset(preset, args.corpus_dir, args.backends.split(","), args.repeat)
+            for preset in presets
+        ],
+    }
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
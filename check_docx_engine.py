@@ -3,14 +3,19 @@ import os
 import re
 import html  # Added for HTML escaping
 import json  # Added for safe JS string generation
-import pandas as pd
-from docx import Document
-from docx.document import Document as _Document
-from docx.oxml.text.paragraph import CT_P
-from docx.oxml.table import CT_Tbl
-from docx.table import _Cell, Table
-from docx.text.paragraph import Paragraph
-from thefuzz import fuzz  # [RESTORED] Re-imported for fuzzy matching
+import argparse
+import array
+import bisect
+import hashlib
+import io
+import multiprocessing
+import threading
+import time
+from docx_styles import StyleResolver, paragraph_outline, paragraph_style_id, run_style_id
+from docx_cache import SectionCache
+from docx_align import ALIGN_CHI_ONLY, ALIGN_ENG_ONLY, ALIGN_MATCH, align_items, align_sections, padded_rows
+from docx_figures import diff_figures
+from audit_stats import AuditStats, measure, profiled
 
 if getattr(sys, 'frozen', False):
     BASE_DIR = os.path.dirname(sys.executable)
@@ -21,40 +26,238 @@ chi_input_docx = os.path.join(BASE_DIR, "chi_input.docx")
 eng_input_docx = os.path.join(BASE_DIR, "eng_input.docx")
 output_html = os.path.join(BASE_DIR, "report.html")
 
-# Set pandas display options
-pd.set_option('display.unicode.east_asian_width', True)
-pd.set_option('display.max_colwidth', None) # Changed to None to allow full HTML rendering
+# Bump whenever parsing output changes, so cached sections from older engines are ignored
+ENGINE_VERSION = "8"
+
+# Default TOC keyword / section title pattern for each language
+CHI_TOC_KEYWORD = "頁碼"
+CHI_TITLE_PATTERN = r"^[甲乙丙丁戊己庚辛壬癸(（].*部\s*[：:]"
+ENG_TOC_KEYWORD = "Page"
+ENG_TITLE_PATTERN = r"^Part.*[：:]"
 
 # ==========================================
 # 1. Data Structures & Utility Functions
 # ==========================================
 
+# Run-level formatting attributes collected by the single-pass extractor.
+# Each entry maps an attribute name to a predicate on a python-docx Run;
+# registering a new one here is enough for it to be extracted and stored.
+RUN_ATTRIBUTES = {
+    'bold': lambda run: run.bold,
+    'underline': lambda run: run.underline,
+}
+
+# A running parse checks its CancelToken and reports progress once every this many body blocks
+CHECKPOINT_BLOCKS = 64
+# ...and parse_document_pair polls both this often while waiting for worker processes
+CANCEL_POLL_SECONDS = 0.1
+# Minimum time between two progress callbacks of the same phase
+PROGRESS_INTERVAL = 0.1
+
+class AuditCancelled(Exception):
+    """Raised at a checkpoint of an audit whose CancelToken was cancelled."""
+
+class CancelToken:
+    """
+    Cooperative cancellation shared between the caller (e.g. the GUI thread) and a
+    running audit: parsing checks it every CHECKPOINT_BLOCKS blocks, report
+    generation before each section, and parse_document_pair terminates its workers.
+    """
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def check(self):
+        """Raise AuditCancelled if cancel() has been called."""
+        if self._event.is_set():
+            raise AuditCancelled("Audit cancelled")
+
+class ProgressReporter:
+    """
+    Rate-limited progress callback. Wraps callback(phase, fraction) so that calls
+    less than min_interval apart are dropped, except the first call of a phase and
+    its completion (fraction 1.0), and repeats of the last reported value are skipped.
+    phase is "toc", "scan", "parse" or "report".
+    """
+    def __init__(self, callback, min_interval=PROGRESS_INTERVAL):
+        self.callback = callback
+        self.min_interval = min_interval
+        self._last = None
+        self._last_time = 0.0
+
+    def __call__(self, phase, fraction):
+        fraction = min(fraction, 1.0)
+        now = time.monotonic()
+        if self._last is not None and self._last[0] == phase:
+            if fraction == self._last[1] or (fraction < 1.0 and now - self._last_time < self.min_interval):
+                return
+        self._last, self._last_time = (phase, fraction), now
+        self.callback(phase, fraction)
+
+def as_progress_reporter(progress):
+    """None, a ProgressReporter, or a plain callback(phase, fraction) to be rate-limited."""
+    if progress is None or isinstance(progress, ProgressReporter):
+        return progress
+    return ProgressReporter(progress)
+
+class FormattedItem:
+    """
+    One formatted span (e.g. a run of bold text). context is an index into the
+    owning section's contexts table, where each paragraph text is stored once;
+    block is the body-level block number (paragraph or table) the span is in and
+    run the index of its first run within its paragraph (-1 when unknown).
+    """
+    __slots__ = ('text', 'context', 'block', 'run')
+
+    def __init__(self, text, context, block=-1, run=-1):
+        self.text = text
+        self.context = context
+        self.block = block
+        self.run = run
+
+    def __repr__(self):
+        return f"FormattedItem({self.text!r}, context={self.context}, block={self.block}, run={self.run})"
+
+def _item_tuples(item_list):
+    """{'text', 'context'[, 'run']} item dicts -> the (text, context, run) tuples of scan_block()."""
+    return [(item['text'], item['context'], item.get('run', -1)) for item in item_list]
+
 class DocumentSection:
     def __init__(self, title):
         self.title = title
         self.content_blocks = []
-        # Stores list of dicts: [{'text': 'BoldWord', 'context': 'Full sentence containing BoldWord'}]
-        self.bold_data = []      
-        self.underline_data = [] 
+        # Paragraph texts that items refer to by index, each stored once
+        self.contexts = []
+        self._context_ids = {}
+        # Maps attribute name -> list of FormattedItem
+        self.formatted_data = {name: [] for name in RUN_ATTRIBUTES}
+        self._digest = None
+
+    def __getstate__(self):
+        # Items are pickled column-wise (texts list + int arrays), which avoids a
+        # per-object reduce call and keeps cache entries / worker results small
+        state = self.__dict__.copy()
+        del state['_context_ids']  # Rebuilt from contexts when needed
+        state['formatted_data'] = {
+            name: (
+                [item.text for item in items],
+                array.array('i', [item.context for item in items]),
+                array.array('i', [item.block for item in items]),
+                array.array('i', [item.run for item in items]),
+            )
+            for name, items in self.formatted_data.items()
+        }
+        return state
+
+    def __setstate__(self, state):
+        state['formatted_data'] = {
+            name: list(map(FormattedItem, *columns)) for name, columns in state['formatted_data'].items()
+        }
+        self.__dict__.update(state)
+        self._context_ids = None
+
+    @property
+    def bold_data(self):
+        return self.formatted_data.setdefault('bold', [])
+
+    @property
+    def underline_data(self):
+        return self.formatted_data.setdefault('underline', [])
     
     def add_content(self, text):
         if text.strip():
             self.content_blocks.append(text)
+            self._digest = None
+
+    def digest(self):
+        """
+        Hash of what the report shows for this section: title, content and item
+        texts with their contexts (not block/run positions, which shift whenever
+        an earlier section is edited). Equal digests render identically.
+        """
+        if self._digest is None:
+            h = hashlib.sha1()
+            for text in [self.title, *self.content_blocks]:
+                h.update(text.encode("utf-8"))
+                h.update(b"\0")
+            for name in sorted(self.formatted_data):
+                h.update(f"\1{name}".encode("utf-8"))
+                for item in self.formatted_data[name]:
+                    h.update(f"{item.text}\0{self.contexts[item.context]}\0".encode("utf-8"))
+            self._digest = h.hexdigest()
+        return self._digest
+
+    def context_id(self, context):
+        """Index of context in self.contexts, adding it on first use."""
+        if self._context_ids is None:
+            self._context_ids = {text: idx for idx, text in enumerate(self.contexts)}
+        idx = self._context_ids.get(context)
+        if idx is None:
+            idx = len(self.contexts)
+            self.contexts.append(context)
+            self._context_ids[context] = idx
+        return idx
+
+    def context_of(self, item):
+        return self.contexts[item.context]
+
+    def add_formatted_items(self, items_by_attr, block=-1):
+        """items_by_attr expects {'bold': [(text, context, run), ...], ...} as produced by scan_block()"""
+        for name, item_list in items_by_attr.items():
+            if item_list:
+                self.formatted_data.setdefault(name, []).extend(
+                    FormattedItem(text, self.context_id(context), block, run)
+                    for text, context, run in item_list
+                )
+                self._digest = None
             
-    def add_bold_items(self, item_list):
-        """item_list expects [{'text':..., 'context':...}, ...]"""
-        if item_list:
-            self.bold_data.extend(item_list)
+    def add_bold_items(self, item_list, block=-1):
+        """item_list expects [{'text':..., 'context':...}, ...] as returned by extract_bold_items()"""
+        self.add_formatted_items({'bold': _item_tuples(item_list)}, block)
 
-    def add_underline_items(self, item_list):
-        """item_list expects [{'text':..., 'context':...}, ...]"""
-        if item_list:
-            self.underline_data.extend(item_list)
+    def add_underline_items(self, item_list, block=-1):
+        """item_list expects [{'text':..., 'context':...}, ...] as returned by extract_underline_items()"""
+        self.add_formatted_items({'underline': _item_tuples(item_list)}, block)
 
     def get_full_content(self):
         return "\n".join(self.content_blocks)
 
+    def to_dict(self):
+        return {
+            'title': self.title,
+            'content_blocks': self.content_blocks,
+            'formatted_data': {
+                name: [
+                    {'text': item.text, 'context': self.contexts[item.context], 'block': item.block, 'run': item.run}
+                    for item in items
+                ]
+                for name, items in self.formatted_data.items()
+            },
+        }
+
+# python-docx (and lxml under it) is imported on first use by _import_docx(), so that
+# importing the engine stays cheap: the GUI window, the stream backend and the
+# CLI's --help don't need it. rapidfuzz is likewise imported in match_toc_titles().
+Document = _Document = CT_P = CT_Tbl = _Cell = Table = Paragraph = None
+
+def _import_docx():
+    global Document, _Document, CT_P, CT_Tbl, _Cell, Table, Paragraph
+    if Paragraph is None:
+        from docx import Document
+        from docx.document import Document as _Document
+        from docx.oxml.text.paragraph import CT_P
+        from docx.oxml.table import CT_Tbl
+        from docx.table import _Cell, Table
+        from docx.text.paragraph import Paragraph
+
 def iter_block_items(parent):
+    _import_docx()
     if isinstance(parent, _Document):
         parent_elm = parent.element.body
     elif isinstance(parent, _Cell):
@@ -68,128 +271,225 @@ def iter_block_items(parent):
         elif isinstance(child, CT_Tbl):
             yield Table(child, parent)
 
+def format_table_text(rows_text):
+    return "\n[表格開始]\n" + "\n".join(rows_text) + "\n[表格結束]"
+
 def get_table_text(table):
     rows_text = []
     for row in table.rows:
         row_data = [cell.text.strip() for cell in row.cells]
         rows_text.append(" | ".join(row_data))
-    return "\n[表格開始]\n" + "\n".join(rows_text) + "\n[表格結束]"
+    return format_table_text(rows_text)
 
-def extract_bold_items(block):
+def collect_run_spans(run_values, para_text, items_by_attr, attributes):
     """
-    Extract bold text AND its context (the full paragraph text).
-    Returns a list of dicts: [{'text': '...', 'context': '...'}]
+    Group consecutive runs that satisfy each attribute predicate into spans.
+    run_values is an iterable of (run_text, run_handle); predicates receive run_handle.
+    Spans are appended to items_by_attr as (text, para_text, index of first run).
     """
-    items = []
-    
-    def process_paragraph(para):
-        para_text = para.text.strip() # The context is the full paragraph
-        if not para_text:
-            return
-
-        buffer_text = ""
-        for run in para.runs:
-            # Check for bold explicitly
-            if run.bold:
-                buffer_text += run.text
+    buffers = {name: "" for name in attributes}
+    starts = {name: 0 for name in attributes}
+    for run_idx, (run_text, run_handle) in enumerate(run_values):
+        for name, predicate in attributes.items():
+            if predicate(run_handle):
+                if not buffers[name]:
+                    starts[name] = run_idx
+                buffers[name] += run_text
             else:
-                if buffer_text.strip():
-                    items.append({
-                        'text': buffer_text.strip(), 
-                        'context': para_text
-                    })
-                buffer_text = ""
-        # Flush buffer at end of paragraph
+                if buffers[name].strip():
+                    items_by_attr[name].append((buffers[name].strip(), para_text, starts[name]))
+                buffers[name] = ""
+    # Flush buffers at end of paragraph
+    for name, buffer_text in buffers.items():
         if buffer_text.strip():
-            items.append({
-                'text': buffer_text.strip(), 
-                'context': para_text
-            })
+            items_by_attr[name].append((buffer_text.strip(), para_text, starts[name]))
 
-    if isinstance(block, Paragraph):
-        process_paragraph(block)
-    elif isinstance(block, Table):
-        for row in block.rows:
-            for cell in row.cells:
-                for para in cell.paragraphs:
-                    process_paragraph(para)
-                    
-    return items
+def _extract_paragraph_items(para, items_by_attr, attributes, resolver=None):
+    """
+    Walk the runs of one paragraph once, filling items_by_attr for every attribute.
+    Returns the raw paragraph text so callers don't have to materialize it again.
+    With a resolver, attributes must already be wrapped by resolver.wrap().
+    """
+    raw_text = para.text
+    para_text = raw_text.strip() # The context is the full paragraph
+    if para_text:
+        if resolver is None:
+            run_values = ((run.text, run) for run in para.runs)
+        else:
+            p_style = paragraph_style_id(para._p)
+            run_values = (
+                (run.text, (run, resolver.run_properties(p_style, run_style_id(run._r))))
+                for run in para.runs
+            )
+        collect_run_spans(run_values, para_text, items_by_attr, attributes)
+    return raw_text
 
-def extract_underline_items(block):
+def scan_block(block, attributes=RUN_ATTRIBUTES, resolver=None):
     """
-    Extract underlined text AND its context.
-    Returns a list of dicts.
+    Single pass over a Paragraph or Table.
+    Returns (text_for_title_check, full_content, items_by_attr) where items_by_attr is
+    {'bold': [(text, context, run), ...], 'underline': [...], ...}.
+    With a StyleResolver, formatting inherited from styles counts as well as direct formatting.
     """
-    items = []
-    
-    def process_paragraph(para):
-        para_text = para.text.strip()
-        if not para_text:
-            return
-
-        buffer_text = ""
-        for run in para.runs:
-            if run.underline:
-                buffer_text += run.text
-            else:
-                if buffer_text.strip():
-                    items.append({
-                        'text': buffer_text.strip(), 
-                        'context': para_text
-                    })
-                buffer_text = ""
-        if buffer_text.strip():
-            items.append({
-                'text': buffer_text.strip(), 
-                'context': para_text
-            })
+    _import_docx()
+    items_by_attr = {name: [] for name in attributes}
+    if resolver is not None:
+        attributes = resolver.wrap(attributes)
 
     if isinstance(block, Paragraph):
-        process_paragraph(block)
-    elif isinstance(block, Table):
-        for row in block.rows:
+        block_text = _extract_paragraph_items(block, items_by_attr, attributes, resolver).strip()
+        return block_text, block_text, items_by_attr
+
+    if isinstance(block, Table):
+        rows_text = []
+        first_row_text = ""
+        # Horizontally merged cells are returned once per grid column by row.cells;
+        # reuse the first result so each <w:tc> is only walked once.
+        seen_cells = {}
+        for row_idx, row in enumerate(block.rows):
+            row_data = []
             for cell in row.cells:
-                for para in cell.paragraphs:
-                    process_paragraph(para)
-                    
-    return items
+                cached = seen_cells.get(cell._tc)
+                if cached is None:
+                    cell_items = {name: [] for name in attributes}
+                    cell_text = "\n".join(
+                        _extract_paragraph_items(para, cell_items, attributes, resolver)
+                        for para in cell.paragraphs
+                    )
+                    cached = (cell_text, cell_items)
+                    seen_cells[cell._tc] = cached
+                cell_text, cell_items = cached
+                for name, item_list in cell_items.items():
+                    items_by_attr[name].extend(item_list)
+                row_data.append(cell_text.strip())
+            if row_idx == 0:
+                first_row_text = " ".join(row_data)
+            rows_text.append(" | ".join(row_data))
+        return first_row_text, format_table_text(rows_text), items_by_attr
+
+    return "", "", items_by_attr
+
+def extract_formatted_items(block, attributes=RUN_ATTRIBUTES, resolver=None):
+    """
+    Extract the text of every registered run attribute AND its context (the full paragraph text).
+    Returns a dict: {'bold': [(text, context, run), ...], 'underline': [...]}
+    """
+    return scan_block(block, attributes, resolver)[2]
+
+def _extract_item_dicts(block, name):
+    items = extract_formatted_items(block, {name: RUN_ATTRIBUTES[name]})[name]
+    return [{'text': text, 'context': context} for text, context, _ in items]
+
+def extract_bold_items(block):
+    """Returns a list of dicts: [{'text': '...', 'context': '...'}]"""
+    return _extract_item_dicts(block, 'bold')
+
+def extract_underline_items(block):
+    """Returns a list of dicts: [{'text': '...', 'context': '...'}]"""
+    return _extract_item_dicts(block, 'underline')
 
 # ==========================================
 # 2. Core Processing Logic
 # ==========================================
 
-def parse_document_sections(file_path, toc_keyword, regex_pattern, log_func=print):
-    if not os.path.exists(file_path):
-        log_func(f"Error: File not found -> {file_path}")
-        return []
+# Raw text of the first rows of a w:tbl, used to spot the TOC table by its keyword
+TABLE_HEADER_XPATH = "./w:tr[position() <= 5]/w:tc/w:p//w:t/text()"
 
-    try:
-        doc = Document(file_path)
-    except Exception as e:
-        log_func(f"Error reading docx: {e}")
-        return []
-    
-    # --- DEBUG START ---
-    log_func(f"\n[DEBUG] Start analyzing file: {os.path.basename(file_path)}")
-    # --- DEBUG END ---
-    
-    # Step A: Extract TOC
-    toc_titles = []
-    for i, table in enumerate(doc.tables):
-        try:
-            sample_rows = table.rows[:5]
-            header_check = "".join([c.text.strip() for r in sample_rows for c in r.cells])
-        except Exception:
-            header_check = ""
+class PythonDocxBackend:
+    """Reads a .docx through python-docx objects (loads the whole package into memory)."""
 
+    def __init__(self, file_path, resolve_styles=True):
+        _import_docx()
+        self.doc = Document(file_path)
+        # Style table is always read (outline levels); run inheritance only when resolve_styles
+        self.styles = StyleResolver(self.doc.styles.element)
+        self.resolver = self.styles if resolve_styles else None
+        self._blocks_total = None
+        self._blocks_done = 0
+
+    def scan_progress(self):
+        """Fraction of the body's paragraphs and tables that iter_blocks() has yielded so far."""
+        if self._blocks_total is None:
+            # Counted on the raw XML: no python-docx objects are created
+            self._blocks_total = sum(
+                1 for child in self.doc.element.body.iterchildren() if isinstance(child, (CT_P, CT_Tbl)))
+        return self._blocks_done / self._blocks_total if self._blocks_total else 1.0
+
+    def build_table_index(self):
+        """
+        Lightweight pre-index of top-level tables: (body position, w:tbl element, header text).
+        The header is the raw w:t text of the first rows, read straight from the XML,
+        so no Table/_Row/_Cell objects (and no grid-span resolution) are created.
+        """
+        index = []
+        for position, child in enumerate(self.doc.element.body.iterchildren()):
+            if isinstance(child, CT_Tbl):
+                header_text = "".join(child.xpath(TABLE_HEADER_XPATH))
+                index.append((position, child, header_text))
+        return index
+
+    def iter_table_headers(self):
+        """Yields (header_check, first_column_texts) for every top-level table."""
+        for _, tbl, header_check in self.build_table_index():
+
+            def first_column_texts(tbl=tbl):
+                # Only the table that matched is materialized through python-docx
+                for row in Table(tbl, self.doc).rows:
+                    cells = row.cells
+                    if not cells: continue
+                    yield cells[0].text
+
+            yield header_check, first_column_texts
+
+    def iter_blocks(self, attributes=RUN_ATTRIBUTES, with_outline=False):
+        """
+        Yields scan_block() results plus an outline entry for every top-level paragraph and table.
+        The outline entry is paragraph_outline() for paragraphs when with_outline is set, else None.
+        """
+        self._blocks_done = 0
+        for block in iter_block_items(self.doc):
+            self._blocks_done += 1
+            outline = None
+            if with_outline and isinstance(block, Paragraph):
+                outline = paragraph_outline(block._p, self.styles)
+            yield (*scan_block(block, attributes, self.resolver), outline)
+
+# Available values for the `backend` argument of parse_document_sections.
+# "stream" reads word/document.xml incrementally (see docx_stream_backend.py).
+PARSE_BACKENDS = ("docx", "stream")
+
+# Available values for the `sectioning` argument of parse_document_sections:
+#   toc_table  split at the titles listed in the TOC table (original behaviour)
+#   outline    split at headings (Heading 1 style / w:outlineLvl, or Word TOC-field targets)
+#   auto       toc_table when the document has one, otherwise outline
+SECTIONING_MODES = ("auto", "toc_table", "outline")
+
+def open_backend(file_path, backend="docx", resolve_styles=True):
+    if backend == "docx":
+        return PythonDocxBackend(file_path, resolve_styles)
+    if backend == "stream":
+        from docx_stream_backend import StreamingDocxBackend
+        return StreamingDocxBackend(file_path, resolve_styles)
+    raise ValueError(f"Unknown parse backend: {backend!r} (expected one of {PARSE_BACKENDS})")
+
+def warm_up():
+    """
+    Pay the first-audit costs ahead of time: import python-docx/lxml and rapidfuzz and
+    build a StyleResolver over python-docx's default template. Safe to call from a
+    background thread; later calls are cheap.
+    """
+    _import_docx()
+    from rapidfuzz import fuzz, process  # noqa: F401
+    StyleResolver(Document().styles.element)
+
+def extract_toc_titles(reader, toc_keyword, regex_pattern):
+    """Step A: Titles listed in the first table whose header contains toc_keyword."""
+    toc_titles = []
+    for header_check, first_column_texts in reader.iter_table_headers():
         if toc_keyword in header_check:
-            for row in table.rows:
-                cells = row.cells
-                if not cells: continue
-                
+            for cell_text in first_column_texts():
                 # [FIX v2]: Multi-line Title Extraction
-                full_cell_text = cells[0].text.strip()
+                full_cell_text = cell_text.strip()
                 lines = [line.strip() for line in full_cell_text.split('\n') if line.strip()]
                 
                 title_parts = []
@@ -210,97 +510,431 @@ def parse_document_sections(file_path, toc_keyword, regex_pattern, log_func=prin
                     full_title = " ".join(title_parts)
                     toc_titles.append(full_title)
             break
+    return toc_titles
 
-    extracted_sections = []
-    current_section = None
-    
+# A block is a fuzzy title match when fuzz.ratio (0-100, rounded) reaches this score
+TITLE_MATCH_SCORE = 80
+# ... and its whitespace-free length is within this ratio of the title's
+TITLE_LENGTH_RATIO = (0.8, 1.2)
+
+def _length_bounds(title_len):
+    """Smallest and largest block length L with TITLE_LENGTH_RATIO[0] <= L / title_len <= TITLE_LENGTH_RATIO[1]."""
+    low_ratio, high_ratio = TITLE_LENGTH_RATIO
+    # Start from the float estimate, then settle on the exact integer edges of the same comparison
+    low = int(low_ratio * title_len)
+    while low / title_len < low_ratio:
+        low += 1
+    while low > 0 and (low - 1) / title_len >= low_ratio:
+        low -= 1
+    high = int(high_ratio * title_len) + 1
+    while high / title_len > high_ratio:
+        high -= 1
+    return low, high
+
+# How many TOC titles past the expected one a block may match, so one missing or
+# mistyped heading does not swallow every later section into the previous one
+TITLE_LOOKAHEAD = 3
+
+def match_toc_titles(block_texts, toc_titles, lookahead=TITLE_LOOKAHEAD):
+    """
+    (title index, block index) for each TOC title found, in document order. Each block
+    is compared with the expected title and the next `lookahead` ones; the earliest
+    matching block wins (the expected title on a tie) and titles jumped over are
+    reported as missing by their absence. Matching stops when none of the window's
+    titles occurs again.
+
+    [HYBRID STRATEGY] A block matches a title on an exact, case- and whitespace-
+    insensitive comparison, or on fuzz.ratio >= TITLE_MATCH_SCORE when its length is
+    within TITLE_LENGTH_RATIO of the title (so a long paragraph that happens to contain
+    similar words is never a title). Rather than scoring block by block, blocks are
+    sorted by length once; a title entering the window scores only its length window,
+    in a single rapidfuzz batch call, and its matching positions are kept for reuse.
+    """
+    from rapidfuzz import fuzz, process
+
+    cleaned = ["".join(text.split()).lower() for text in block_texts]
+    exact_positions = {}
+    for idx, text in enumerate(cleaned):
+        exact_positions.setdefault(text, []).append(idx)
+
+    by_length = sorted(range(len(block_texts)), key=lambda idx: len(cleaned[idx]))
+    sorted_lengths = [len(cleaned[idx]) for idx in by_length]
+    sorted_texts = [block_texts[idx].lower() for idx in by_length]
+    # int(round(score)) >= 80, as thefuzz reported it, means score >= 79.5
+    score_cutoff = TITLE_MATCH_SCORE - 0.5
+    title_positions = {}
+
+    def positions_of(title_idx):
+        """Sorted block indices matching toc_titles[title_idx]."""
+        positions = title_positions.get(title_idx)
+        if positions is not None:
+            return positions
+        target_title = toc_titles[title_idx]
+        target_clean = "".join(target_title.split()).lower()
+        positions = []
+        if target_clean:
+            # 1. Exact match (best case)
+            positions.extend(exact_positions.get(target_clean, ()))
+            # 2. Fuzzy match (robustness for Certificate vs Confirmation), length window only
+            low, high = _length_bounds(len(target_clean))
+            lo = bisect.bisect_left(sorted_lengths, low)
+            hi = bisect.bisect_right(sorted_lengths, high)
+            if lo < hi:
+                matches = process.extract(
+                    target_title.lower(), sorted_texts[lo:hi], scorer=fuzz.ratio,
+                    processor=None, score_cutoff=score_cutoff, limit=None,
+                )
+                positions.extend(by_length[lo + k] for _, _, k in matches)
+            positions = sorted(set(positions))
+        title_positions[title_idx] = positions
+        return positions
+
+    starts = []
+    cursor = 0
+    position = 0
+    while cursor < len(toc_titles):
+        best = None
+        for title_idx in range(cursor, min(cursor + lookahead + 1, len(toc_titles))):
+            positions = positions_of(title_idx)
+            k = bisect.bisect_left(positions, position)
+            if k < len(positions) and (best is None or positions[k] < best[1]):
+                best = (title_idx, positions[k])
+        if best is None:
+            break
+        starts.append(best)
+        cursor = best[0] + 1
+        position = best[1] + 1
+    return starts
+
+def build_sections(blocks, toc_titles, file_name, log_func=print, stats=None):
+    """
+    Step B: Full text scan. Splits the (text_for_title_check, full_content, items_by_attr, outline)
+    block stream into DocumentSections at each TOC title, or one section if there is no TOC.
+    A title that is not found (skipped by the lookahead, or after the last match) gets
+    an empty section and a warning, so sections stay paired by position.
+    """
     if not toc_titles:
-        log_func(f"Warning: No TOC found in {os.path.basename(file_path)}.")
+        log_func(f"Warning: No TOC found in {file_name}.")
         log_func(">>> Switching to 'Whole Document' mode (Single Section).")
-        single_section = DocumentSection(f"Whole Document ({os.path.basename(file_path)})")
-        extracted_sections = [single_section]
-        current_section = single_section
-    else:
-        log_func(f"Found {len(toc_titles)} sections in {os.path.basename(file_path)}")
-        extracted_sections = []
-        current_section = None
+        single_section = DocumentSection(f"Whole Document ({file_name})")
+        for block_no, (block_text_for_check, full_block_content, current_items, _) in enumerate(blocks):
+            if block_text_for_check:
+                single_section.add_content(full_block_content)
+                single_section.add_formatted_items(current_items, block_no)
+        return [single_section]
 
-    # Step B: Full text scan
-    title_cursor = 0 
-    
-    for block in iter_block_items(doc):
-        block_text_for_check = ""
-        full_block_content = ""
-        
-        current_bold_items = extract_bold_items(block)
-        current_underline_items = extract_underline_items(block)
+    log_func(f"Found {len(toc_titles)} sections in {file_name}")
+    # (body block number, block) for the non-empty blocks
+    blocks = [(block_no, block) for block_no, block in enumerate(blocks) if block[0]]
 
-        if isinstance(block, Paragraph):
-            block_text_for_check = block.text.strip()
-            full_block_content = block_text_for_check
-            
-        elif isinstance(block, Table):
-            if block.rows:
-                block_text_for_check = " ".join([c.text.strip() for c in block.rows[0].cells])
-            full_block_content = get_table_text(block)
+    with measure(stats, "fuzzy_match", file_name):
+        starts = match_toc_titles([block[0] for _, block in blocks], toc_titles)
+
+    if not starts:
+        log_func(f"Warning: None of the {len(toc_titles)} TOC titles were found in the body of {file_name}.")
+
+    def add_missing(title_indices):
+        for missing_idx in title_indices:
+            log_func(f"Warning: Section title not found in {file_name}: {toc_titles[missing_idx]}")
+            extracted_sections.append(DocumentSection(toc_titles[missing_idx]))
+
+    # Content before the first matched title belongs to no section
+    extracted_sections = []
+    next_title = 0
+    boundaries = [start for _, start in starts[1:]] + [len(blocks)]
+    for (title_idx, start), end in zip(starts, boundaries):
+        add_missing(range(next_title, title_idx))
+        next_title = title_idx + 1
 
+        current_section = DocumentSection(toc_titles[title_idx])
+        for block_no, (_, full_block_content, current_items, _) in blocks[start:end]:
+            current_section.add_content(full_block_content)
+            current_section.add_formatted_items(current_items, block_no)
+        extracted_sections.append(current_section)
+    # Titles after the last match were not found either
+    add_missing(range(next_title, len(toc_titles)))
+
+    return extracted_sections
+
+def build_outline_sections(blocks, file_name, log_func=print, outline_level=0):
+    """
+    Step B for documents without a TOC table. A paragraph starts a section when its
+    outline level (direct w:outlineLvl or from its style, Heading 1 = 0) is at most
+    outline_level, or when it has no outline level but is the target of a Word TOC
+    field entry (_Toc bookmark). The heading text becomes the section title; content
+    before the first heading is not part of any section, as in TOC mode.
+    Falls back to one 'Whole Document' section when no heading is found.
+    """
+    whole_document = DocumentSection(f"Whole Document ({file_name})")
+    extracted_sections = []
+    current_section = whole_document
+
+    for block_no, (block_text_for_check, full_block_content, current_items, outline) in enumerate(blocks):
         if not block_text_for_check:
             continue
 
-        matched_new_title = False
-        if toc_titles and title_cursor < len(toc_titles):
-            target_title = toc_titles[title_cursor]
-            
-            # [HYBRID STRATEGY]
-            # 1. Prepare strings
-            target_clean = "".join(target_title.split())
-            block_clean = "".join(block_text_for_check.split())
-            
-            # 2. Attempt Exact Match (Best case)
-            if target_clean and block_clean and target_clean.lower() == block_clean.lower():
-                matched_new_title = True
-            
-            # 3. Attempt Fuzzy Match (Robustness for Certificate vs Confirmation)
-            # Only if Exact Match failed
-            elif target_title and block_text_for_check:
-                len_t = len(target_clean)
-                len_b = len(block_clean)
-                
-                # Length Safety Check:
-                # The block text length must be within +/- 20% of the target title length.
-                # This prevents matching a title to a long paragraph that happens to contain similar words.
-                if len_t > 0:
-                    ratio = len_b / len_t
-                    if 0.8 <= ratio <= 1.2:
-                        # Use fuzz.ratio for strict similarity check
-                        # Threshold 80 should cover "Certificate" vs "Confirmation" (~85% similarity in context)
-                        score = fuzz.ratio(target_title.lower(), block_text_for_check.lower())
-                        if score >= 80:
-                            matched_new_title = True
-        
-        if matched_new_title:
-            if current_section:
+        if outline is not None:
+            level, is_toc_target = outline
+            if (level is not None and level <= outline_level) or (level is None and is_toc_target):
+                current_section = DocumentSection(block_text_for_check)
                 extracted_sections.append(current_section)
-            clean_title = toc_titles[title_cursor]
-            current_section = DocumentSection(clean_title)
-            title_cursor += 1
-            # Don't 'continue' here, allow the title itself to be processed if needed
 
-        if current_section:
-            current_section.add_content(full_block_content)
-            current_section.add_bold_items(current_bold_items)
-            current_section.add_underline_items(current_underline_items)
+        current_section.add_content(full_block_content)
+        current_section.add_formatted_items(current_items, block_no)
 
-    if toc_titles and current_section:
-        extracted_sections.append(current_section)
+    if not extracted_sections:
+        log_func(f"Warning: No TOC or headings found in {file_name}.")
+        log_func(">>> Switching to 'Whole Document' mode (Single Section).")
+        return [whole_document]
 
+    log_func(f"Found {len(extracted_sections)} headings in {file_name}")
     return extracted_sections
 
+def _with_checkpoints(blocks, reader, cancel, progress):
+    """Pass blocks through, checking cancel and reporting the reader's scan progress every CHECKPOINT_BLOCKS blocks."""
+    for block_no, block in enumerate(blocks):
+        if block_no % CHECKPOINT_BLOCKS == 0:
+            if cancel is not None:
+                cancel.check()
+            if progress is not None:
+                progress("scan", reader.scan_progress())
+        yield block
+    if progress is not None:
+        progress("scan", 1.0)
+
+def parse_document_sections(file_path, toc_keyword, regex_pattern, log_func=print, backend="docx",
+                            resolve_styles=True, cache=None, stats=None, sectioning="auto", outline_level=0,
+                            cancel=None, progress=None):
+    """
+    Split a .docx into DocumentSections with their content and formatted items.
+    sectioning picks how section boundaries are found (see SECTIONING_MODES);
+    outline_level is the deepest heading level that starts a section in outline mode.
+    Pass an AuditStats as stats to record per-phase timing (see audit_stats.py),
+    a CancelToken as cancel to be able to stop the parse (raises AuditCancelled),
+    and a progress(phase, fraction) callback to follow the "toc" and "scan" phases
+    (rate-limited by ProgressReporter).
+    """
+    if sectioning not in SECTIONING_MODES:
+        raise ValueError(f"Unknown sectioning mode: {sectioning!r} (expected one of {SECTIONING_MODES})")
+    with measure(stats, "parse", os.path.basename(file_path)):
+        return _parse_document_sections(
+            file_path, toc_keyword, regex_pattern, log_func, backend, resolve_styles, cache, stats,
+            sectioning, outline_level, cancel, as_progress_reporter(progress))
+
+def _cache_key(cache, file_path, toc_keyword, regex_pattern, backend, resolve_styles, sectioning, outline_level):
+    return cache.make_key(
+        file_path, ENGINE_VERSION, toc_keyword, regex_pattern, backend, resolve_styles, sectioning, outline_level)
+
+def _parse_document_sections(file_path, toc_keyword, regex_pattern, log_func, backend, resolve_styles, cache, stats,
+                             sectioning, outline_level, cancel, progress):
+    file_name = os.path.basename(file_path)
+    if not os.path.exists(file_path):
+        log_func(f"Error: File not found -> {file_path}")
+        return []
+
+    # Unchanged file + same parameters: reuse the previous parse (see docx_cache.py)
+    cache_key = None
+    if cache is not None:
+        try:
+            cache_key = _cache_key(
+                cache, file_path, toc_keyword, regex_pattern, backend, resolve_styles, sectioning, outline_level)
+            cached_sections = cache.get(cache_key)
+        except OSError as e:
+            log_func(f"Warning: Parse cache unavailable ({e}).")
+            cache_key = cached_sections = None
+        if cached_sections is not None:
+            log_func(f"Loaded {len(cached_sections)} sections for {file_name} from cache.")
+            if progress is not None:
+                progress("scan", 1.0)
+            return cached_sections
+
+    try:
+        reader = open_backend(file_path, backend, resolve_styles)
+    except Exception as e:
+        log_func(f"Error reading docx: {e}")
+        return []
+    
+    # --- DEBUG START ---
+    log_func(f"\n[DEBUG] Start analyzing file: {file_name}")
+    # --- DEBUG END ---
+    
+    # Step A: Extract TOC
+    toc_titles = []
+    if sectioning != "outline":
+        if progress is not None:
+            progress("toc", 0.0)
+        with measure(stats, "toc", file_name):
+            toc_titles = extract_toc_titles(reader, toc_keyword, regex_pattern)
+
+    # Step B: Full text scan
+    with measure(stats, "scan", file_name):
+        by_toc = toc_titles or sectioning == "toc_table"
+        blocks = reader.iter_blocks(with_outline=not by_toc)
+        if cancel is not None or progress is not None:
+            blocks = _with_checkpoints(blocks, reader, cancel, progress)
+        if by_toc:
+            extracted_sections = build_sections(blocks, toc_titles, file_name, log_func, stats)
+        else:
+            if sectioning == "auto":
+                log_func(f"No TOC table in {file_name}, sectioning by headings.")
+            extracted_sections = build_outline_sections(blocks, file_name, log_func, outline_level)
+
+    if cache_key is not None:
+        try:
+            cache.put(cache_key, extracted_sections)
+        except OSError as e:
+            log_func(f"Warning: Could not write parse cache ({e}).")
+
+    return extracted_sections
+
+# Queue of (job index, phase, fraction) set in each worker process by _init_worker
+_worker_progress_queue = None
+
+def _init_worker(progress_queue):
+    global _worker_progress_queue
+    _worker_progress_queue = progress_queue
+
+def _parse_in_worker(file_path, toc_keyword, regex_pattern, backend, resolve_styles, cache, track_stats,
+                     sectioning, outline_level, job_idx=0):
+    """
+    Process-pool entry point: log lines and stats are collected and shipped back with the sections.
+    Progress, if the pool was given a queue, is sent back through it as the parse goes.
+    """
+    logs = []
+    stats = AuditStats(track_memory=track_stats == "memory") if track_stats else None
+    progress = None
+    if _worker_progress_queue is not None:
+        progress = lambda phase, fraction: _worker_progress_queue.put((job_idx, phase, fraction))
+    sections = parse_document_sections(
+        file_path, toc_keyword, regex_pattern, logs.append, backend, resolve_styles, cache, stats,
+        sectioning, outline_level, progress=progress)
+    return sections, logs, stats
+
+def parse_document_pair(chi_path, eng_path,
+                        chi_toc_keyword=CHI_TOC_KEYWORD, chi_pattern=CHI_TITLE_PATTERN,
+                        eng_toc_keyword=ENG_TOC_KEYWORD, eng_pattern=ENG_TITLE_PATTERN,
+                        log_func=print, workers=2, backend="docx", resolve_styles=True, cache=None,
+                        stats=None, sectioning="auto", outline_level=0, cancel=None, progress=None):
+    """
+    Parse the Chinese and English documents, in two worker processes when workers > 1.
+    Returns (sections_chi, sections_eng). Worker log lines are replayed through
+    log_func once each document is done, Chinese first; worker stats are merged into stats.
+    When cancel (a CancelToken) is cancelled, workers are terminated and AuditCancelled is raised.
+    progress(phase, fraction) receives phase "parse" with the mean scan progress of both documents.
+    """
+    progress = as_progress_reporter(progress)
+    doc_fractions = [0.0, 0.0]
+
+    def doc_progress(job_idx, phase, fraction):
+        if phase == "scan":
+            doc_fractions[job_idx] = fraction
+            progress("parse", sum(doc_fractions) / len(doc_fractions))
+
+    def side_progress(job_idx):
+        """progress callback for one document parsed in this process."""
+        if progress is None:
+            return None
+        return lambda phase, fraction: doc_progress(job_idx, phase, fraction)
+
+    track_stats = None if stats is None else ("memory" if stats.track_memory else "time")
+    jobs = [
+        (chi_path, chi_toc_keyword, chi_pattern, backend, resolve_styles, cache, track_stats,
+         sectioning, outline_level),
+        (eng_path, eng_toc_keyword, eng_pattern, backend, resolve_styles, cache, track_stats,
+         sectioning, outline_level),
+    ]
+
+    if workers > 1 and cache is not None:
+        # On a re-audit usually only one document changed: loading the other from the
+        # cache is faster than starting a worker, so the pool is only used for two misses
+        misses = 0
+        for file_path, toc_keyword, regex_pattern, *_ in jobs:
+            try:
+                key = _cache_key(
+                    cache, file_path, toc_keyword, regex_pattern, backend, resolve_styles, sectioning, outline_level)
+            except OSError:
+                key = None
+            misses += key is None or key not in cache
+        if misses < 2:
+            workers = 1
+
+    if workers > 1:
+        try:
+            # "spawn" everywhere: forking a process that runs Tk threads is unsafe,
+            # and it is what Windows/macOS (and the frozen app) use anyway.
+            context = multiprocessing.get_context("spawn")
+            progress_queue = context.Queue() if progress is not None else None
+            pool = context.Pool(
+                processes=min(workers, len(jobs)), initializer=_init_worker, initargs=(progress_queue,))
+        except OSError as e:
+            log_func(f"Warning: Could not start worker processes ({e}), parsing sequentially.")
+        else:
+            with pool:  # Leaving the block terminates the workers, also on cancel
+                pending = [pool.apply_async(_parse_in_worker, (*job, job_idx)) for job_idx, job in enumerate(jobs)]
+                results = []
+                for job in pending:
+                    while not job.ready():
+                        if cancel is not None:
+                            cancel.check()
+                        if progress_queue is not None:
+                            while not progress_queue.empty():
+                                doc_progress(*progress_queue.get())
+                        job.wait(CANCEL_POLL_SECONDS)
+                    sections, logs, job_stats = job.get()
+                    for line in logs:
+                        log_func(line)
+                    if stats is not None:
+                        stats.merge(job_stats)
+                    results.append(sections)
+            if progress is not None:
+                progress("parse", 1.0)
+            return results[0], results[1]
+
+    sections_chi = parse_document_sections(
+        chi_path, chi_toc_keyword, chi_pattern, log_func, backend, resolve_styles, cache, stats,
+        sectioning, outline_level, cancel, side_progress(0))
+    sections_eng = parse_document_sections(
+        eng_path, eng_toc_keyword, eng_pattern, log_func, backend, resolve_styles, cache, stats,
+        sectioning, outline_level, cancel, side_progress(1))
+    return sections_chi, sections_eng
+
 # ==========================================
 # 3. HTML Generation (Enhanced with Clipboard)
 # ==========================================
 
-def generate_html_report(sections_chi, sections_eng, output_path):
+class ReportMemo:
+    """
+    Work kept from the previous generate_html_report() call for an incremental
+    re-audit: rendered section bodies keyed by (alignment kind, Chinese digest,
+    English digest) and align_sections() features keyed by section digest.
+    After editing one document only the sections whose content changed are
+    re-rendered; the alignment DP itself is cheap and always re-run.
+    """
+    def __init__(self):
+        self.fragments = {}
+        self.features = {}
+        self.reused = 0
+        self.rendered = 0
+
+def generate_html_report(sections_chi, sections_eng, output_path, stats=None, memo=None, cancel=None,
+                         progress=None):
+    """
+    Write the side-by-side HTML report. memo (a ReportMemo) reuses unchanged sections
+    from the previous call, cancel (a CancelToken) is checked before each section and
+    progress(phase, fraction) receives phase "report" with the share of sections written.
+    """
+    with measure(stats, "report", os.path.basename(output_path)):
+        try:
+            _write_html_report(sections_chi, sections_eng, output_path, memo, cancel, as_progress_reporter(progress))
+        except AuditCancelled:
+            # Don't leave a truncated report behind
+            try:
+                os.remove(output_path)
+            except OSError:
+                pass
+            raise
+
+def _write_html_report(sections_chi, sections_eng, output_path, memo=None, cancel=None, progress=None):
     # CSS & JS for Clipboard Functionality
     HTML_HEADER = """
     <!DOCTYPE html>
@@ -336,6 +970,8 @@ def generate_html_report(sections_chi, sections_eng, output_path):
         tr:nth-child(even){background-color:#fcfcfc}
         tr:hover{background-color:#f1f8ff;transition:.2s}
         .empty-msg{color:#95a5a6;font-style:italic;padding:10px;border:1px dashed #ccc;background:#fafafa}
+        tr.chi_only td,tr.eng_only td{background-color:#fff4e5}
+        .missing-msg{color:#c0392b;font-weight:700;padding:8px;margin-top:10px;border:1px solid #e6b0aa;background:#fdedec}
     </style>
     <script>
         function copyToClipboard(text, btnElement) {
@@ -362,6 +998,17 @@ def generate_html_report(sections_chi, sections_eng, output_path):
                 alert("Failed to copy context.");
             });
         }
+
+        // Paragraph contexts are stored once per section in the JSON block at the end
+        // of the page; buttons carry the context index, the section comes from their container.
+        let reportContexts = null;
+        function copyContext(btnElement, contextIdx) {
+            if (reportContexts === null) {
+                reportContexts = JSON.parse(document.getElementById("report-contexts").textContent);
+            }
+            const sectionIdx = btnElement.closest(".section-container").dataset.section;
+            copyToClipboard(reportContexts[sectionIdx][contextIdx], btnElement);
+        }
     </script>
     </head>
     <body>
@@ -375,88 +1022,262 @@ def generate_html_report(sections_chi, sections_eng, output_path):
     </body></html>
     """
 
-    def format_item_html(item_dict):
-        """
-        Takes a dict {'text': '...', 'context': '...'} and returns HTML string with button.
-        """
-        if not item_dict:
-            return ""
-        
-        # Escape HTML special characters for display
-        # Also clean up newlines in the *displayed* text to avoid weird spacing
-        text_val = item_dict.get('text', '')
-        display_text = html.escape(text_val).replace('\n', ' ')
-        
-        # Escape context for insertion into JavaScript string
-        # We use json.dumps to safely encode the string for JS, then slice off the quotes
-        raw_context = item_dict.get('context', '')
-        js_safe_context = json.dumps(raw_context).replace('"', '&quot;')
-        
-        # HTML Block - Constructed in one line to avoid introducing \n into the output
-        html_block = (
-            f'<div class="item-wrapper">'
-            f'<button class="copy-btn" onclick="copyToClipboard({js_safe_context}, this)" title="Copy context to search">📋</button>'
-            f'<span class="text-content">{display_text}</span>'
-            f'</div>'
+    # Unique contexts per section, written once as JSON at the end of the report
+    section_contexts = []
+
+    def render_section(kind, sec_c, sec_e):
+        """Body of one aligned section pair as (html, contexts); it does not depend on its position."""
+        out = io.StringIO()
+        contexts = []
+        context_ids = {}
+
+        def context_id(raw_context):
+            ctx_id = context_ids.get(raw_context)
+            if ctx_id is None:
+                ctx_id = len(contexts)
+                contexts.append(raw_context)
+                context_ids[raw_context] = ctx_id
+            return ctx_id
+
+        def format_item_html(section, item):
+            """
+            Takes a FormattedItem of section (or a {'text', 'context'} dict) and returns HTML string with button.
+            """
+            if not item:
+                return ""
+            if isinstance(item, dict):
+                text_val, raw_context = item.get('text', ''), item.get('context', '')
+            else:
+                text_val, raw_context = item.text, section.context_of(item)
+
+            # Escape HTML special characters for display
+            # Also clean up newlines in the *displayed* text to avoid weird spacing
+            display_text = html.escape(text_val).replace('\n', ' ')
+
+            # The button only carries the index of the context in this section's table
+            ctx_id = context_id(raw_context)
+
+            # HTML Block - Constructed in one line to avoid introducing \n into the output
+            html_block = (
+                f'<div class="item-wrapper">'
+                f'<button class="copy-btn" onclick="copyContext(this, {ctx_id})" title="Copy context to search">📋</button>'
+                f'<span class="text-content">{display_text}</span>'
+                f'</div>'
+            )
+            return html_block
+
+        def write_comparison_table(f, list_c, list_e, col_c_name, col_e_name, pair_rows=align_items):
+            """
+            Stream the side-by-side table straight to f, one row at a time.
+            Items are paired by pair_rows (align_items by default); rows with only one side are highlighted.
+            """
+            if not list_c and not list_e:
+                f.write('<div class="empty-msg">No Content</div>')
+                return
+
+            f.write(
+                '<table class="dataframe table">\n'
+                '  <thead>\n'
+                '    <tr style="text-align: left;">\n'
+                '      <th></th>\n'
+                f'      <th>{col_c_name}</th>\n'
+                f'      <th>{col_e_name}</th>\n'
+                '    </tr>\n'
+                '  </thead>\n'
+                '  <tbody>\n'
+            )
+            for row_no, (row_kind, item_c, item_e) in enumerate(pair_rows(list_c, list_e), 1):
+                row_class = '' if row_kind == ALIGN_MATCH else f' class="{row_kind}"'
+                f.write(
+                    f'    <tr{row_class}>\n'
+                    f'      <th>{row_no}</th>\n'
+                    f'      <td>{format_item_html(sec_c, item_c)}</td>\n'
+                    f'      <td>{format_item_html(sec_e, item_e)}</td>\n'
+                    '    </tr>\n'
+                )
+            f.write('  </tbody>\n</table>')
+
+        title_c = sec_c.title if sec_c else "(No such section)"
+        title_e = sec_e.title if sec_e else "(Section Missing)"
+        out.write(f'<div class="sub-info"><b>CH Title:</b> {title_c}</div>')
+        out.write(f'<div class="sub-info"><b>EN Title:</b> {title_e}</div>')
+        if kind == ALIGN_CHI_ONLY:
+            out.write('<div class="missing-msg">Missing section: no matching section in the English document</div>')
+        elif kind == ALIGN_ENG_ONLY:
+            out.write('<div class="missing-msg">Missing section: no matching section in the Chinese document</div>')
+
+        out.write('<div class="category-header">1. Bold Text (Click 📋 to copy context)</div>')
+        write_comparison_table(
+            out,
+            sec_c.bold_data if sec_c else [], 
+            sec_e.bold_data if sec_e else [], 
+            "Chinese (Bold)", 
+            "English (Bold)"
         )
-        return html_block
 
-    def create_comparison_table(list_c, list_e, col_c_name, col_e_name):
-        # list_c and list_e are lists of dictionaries now
-        if not list_c and not list_e:
-            return '<div class="empty-msg">No Content</div>'
-            
-        max_rows = max(len(list_c), len(list_e))
-        
-        # Convert dictionaries to HTML strings
-        html_c = [format_item_html(item) for item in list_c]
-        html_e = [format_item_html(item) for item in list_e]
-        
-        # Pad lists
-        html_c_padded = html_c + [""] * (max_rows - len(html_c))
-        html_e_padded = html_e + [""] * (max_rows - len(html_e))
-        
-        df = pd.DataFrame({
-            col_c_name: html_c_padded, 
-            col_e_name: html_e_padded
-        })
-        df.index += 1
-        
-        # escape=False is CRITICAL here to render the button HTML we created
-        return df.to_html(classes='table', border=0, justify='left', escape=False)
+        out.write('<div class="category-header">2. Underlined Text (Click 📋 to copy context)</div>')
+        write_comparison_table(
+            out,
+            sec_c.underline_data if sec_c else [], 
+            sec_e.underline_data if sec_e else [], 
+            "Chinese (Underline)", 
+            "English (Underline)"
+        )
+
+        # Figures are listed side by side, not paired: each row is a mismatch on its own
+        figures_c, figures_e = diff_figures(sec_c, sec_e)
+        out.write('<div class="category-header">3. Figures on One Side Only (amounts, %, dates, clause numbers)</div>')
+        if figures_c or figures_e:
+            write_comparison_table(out, figures_c, figures_e, "Chinese only", "English only", pair_rows=padded_rows)
+        else:
+            out.write('<div class="empty-msg">All figures match</div>')
+        return out.getvalue(), contexts
 
+    fragments = {}
+    reused = 0
     with open(output_path, "w", encoding="utf-8") as f:
         f.write(HTML_HEADER)
-        max_sections = max(len(sections_chi), len(sections_eng))
-        
-        for i in range(max_sections):
-            sec_c = sections_chi[i] if i < len(sections_chi) else None
-            sec_e = sections_eng[i] if i < len(sections_eng) else None
-            
-            title_c = sec_c.title if sec_c else "(No such section)"
-            title_e = sec_e.title if sec_e else "(Section Missing)"
-            
-            f.write(f'<div class="section-container">')
+        # Sections are paired by align_sections(), not by position
+        feature_cache = memo.features if memo is not None else None
+        section_rows = align_sections(sections_chi, sections_eng, feature_cache)
+        for i, (kind, sec_c, sec_e) in enumerate(section_rows):
+            if cancel is not None:
+                cancel.check()
+            if progress is not None:
+                progress("report", i / len(section_rows))
+            key = (kind, sec_c.digest() if sec_c else None, sec_e.digest() if sec_e else None)
+            fragment = fragments.get(key) or (memo.fragments.get(key) if memo is not None else None)
+            if fragment is None:
+                fragment = render_section(kind, sec_c, sec_e)
+            else:
+                reused += 1
+            fragments[key] = fragment
+            body, contexts = fragment
+            section_contexts.append(contexts)
+
+            f.write(f'<div class="section-container" data-section="{i}">')
             f.write(f'<div class="section-header"><div><strong>Section {i+1}</strong></div></div>')
-            f.write(f'<div class="sub-info"><b>CH Title:</b> {title_c}</div>')
-            f.write(f'<div class="sub-info"><b>EN Title:</b> {title_e}</div>')
-            
-            f.write('<div class="category-header">1. Bold Text (Click 📋 to copy context)</div>')
-            f.write(create_comparison_table(
-                sec_c.bold_data if sec_c else [], 
-                sec_e.bold_data if sec_e else [], 
-                "Chinese (Bold)", 
-                "English (Bold)"
-            ))
-            
-            f.write('<div class="category-header">2. Underlined Text (Click 📋 to copy context)</div>')
-            f.write(create_comparison_table(
-                sec_c.underline_data if sec_c else [], 
-                sec_e.underline_data if sec_e else [], 
-                "Chinese (Underline)", 
-                "English (Underline)"
-            ))
-            
+            f.write(body)
             f.write('</div>') # End section-container
+
+        # "<" is escaped so no context can close the script element early
+        contexts_json = json.dumps(section_contexts, ensure_ascii=False).replace('<', '\\u003c')
+        f.write(f'<script type="application/json" id="report-contexts">{contexts_json}</script>')
             
-        f.write(HTML_FOOTER)
\ No newline at end of file
+        f.write(HTML_FOOTER)
+
+    if progress is not None:
+        progress("report", 1.0)
+    if memo is not None:
+        # Only what this report used is kept, so the memo stays the size of one audit
+        memo.fragments = fragments
+        used = {digest for _, digest_c, digest_e in fragments for digest in (digest_c, digest_e)}
+        memo.features = {digest: features for digest, features in feature_cache.items() if digest in used}
+        memo.reused, memo.rendered = reused, len(section_contexts) - reused
+
+def write_json_report(sections_chi, sections_eng, output_path):
+    # Section pairing as indices into the two lists (null = missing on that side)
+    index_c = {id(sec): i for i, sec in enumerate(sections_chi)}
+    index_e = {id(sec): i for i, sec in enumerate(sections_eng)}
+    alignment = []
+    for kind, sec_c, sec_e in align_sections(sections_chi, sections_eng):
+        figures_c, figures_e = diff_figures(sec_c, sec_e)
+        alignment.append({
+            'kind': kind,
+            'chinese': index_c.get(id(sec_c)),
+            'english': index_e.get(id(sec_e)),
+            'figures': {
+                'chinese_only': {item['key']: item['count'] for item in figures_c},
+                'english_only': {item['key']: item['count'] for item in figures_e},
+            },
+        })
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump({
+            'chinese': [sec.to_dict() for sec in sections_chi],
+            'english': [sec.to_dict() for sec in sections_eng],
+            'alignment': alignment,
+        }, f, ensure_ascii=False, indent=2)
+
+# ==========================================
+# 4. Command Line Interface
+# ==========================================
+
+def main(argv=None):
+    """Headless audit of one document pair (no Tk / ttkbootstrap import)."""
+    parser = argparse.ArgumentParser(description="Compare bold/underline text between a Chinese and an English .docx.")
+    parser.add_argument("chi", nargs="?", default=chi_input_docx, help="Chinese .docx (default: %(default)s)")
+    parser.add_argument("eng", nargs="?", default=eng_input_docx, help="English .docx (default: %(default)s)")
+    parser.add_argument("-o", "--output", default=None, help=f"report path (default: {output_html} or .json)")
+    parser.add_argument("--format", choices=("html", "json"), default="html", help="report format")
+    parser.add_argument("--chi-toc-keyword", default=CHI_TOC_KEYWORD, help="TOC table keyword in the Chinese file")
+    parser.add_argument("--eng-toc-keyword", default=ENG_TOC_KEYWORD, help="TOC table keyword in the English file")
+    parser.add_argument("--chi-pattern", default=CHI_TITLE_PATTERN, help="regex for Chinese section titles")
+    parser.add_argument("--eng-pattern", default=ENG_TITLE_PATTERN, help="regex for English section titles")
+    parser.add_argument("--workers", type=int, default=2, help="parse worker processes (1 = in-process)")
+    parser.add_argument("--backend", choices=PARSE_BACKENDS, default="docx", help="document parsing backend")
+    parser.add_argument("--no-style-resolution", action="store_true", help="only count direct run formatting")
+    parser.add_argument("--sectioning", choices=SECTIONING_MODES, default="auto",
+                        help="split at TOC-table titles, at headings, or TOC table when present (default)")
+    parser.add_argument("--outline-level", type=int, default=1,
+                        help="in heading mode, deepest heading level that starts a section (1 = Heading 1)")
+    parser.add_argument("--cache-dir", default=None, help="parsed-section cache folder (default: per-user cache)")
+    parser.add_argument("--no-cache", action="store_true", help="always re-parse both documents")
+    parser.add_argument("--timing", action="store_true", help="print wall time and call counts per phase and document")
+    parser.add_argument("--memory", action="store_true", help="also track peak memory per phase (implies --timing, slower)")
+    parser.add_argument("--stats-json", default=None, help="write the per-phase stats to this JSON file")
+    parser.add_argument("--profile", default=None, help="dump a cProfile .pstats file (parses in-process)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="only print errors and warnings")
+    args = parser.parse_args(argv)
+    # Word outline levels are Heading 1-9 (w:outlineLvl 0-8)
+    if not 1 <= args.outline_level <= 9:
+        parser.error(f"--outline-level must be between 1 and 9 (got {args.outline_level})")
+
+    def log_func(msg):
+        if not args.quiet or "Error" in msg or "Warning" in msg:
+            print(msg)
+
+    output_path = args.output or (output_html if args.format == "html" else os.path.splitext(output_html)[0] + ".json")
+
+    want_stats = args.timing or args.memory or args.stats_json
+    stats = AuditStats(track_memory=args.memory) if want_stats else None
+    # Worker processes are invisible to cProfile, so profiling parses in-process
+    workers = 1 if args.profile else args.workers
+
+    with profiled(args.profile):
+        with measure(stats, "audit"):
+            sections_chi, sections_eng = parse_document_pair(
+                args.chi, args.eng,
+                args.chi_toc_keyword, args.chi_pattern, args.eng_toc_keyword, args.eng_pattern,
+                log_func=log_func, workers=workers, backend=args.backend,
+                resolve_styles=not args.no_style_resolution,
+                sectioning=args.sectioning, outline_level=args.outline_level - 1,
+                cache=None if args.no_cache else SectionCache(args.cache_dir),
+                stats=stats,
+            )
+            if not sections_chi or not sections_eng:
+                print("Error: Nothing to compare, see messages above.")
+                return 1
+
+            if args.format == "json":
+                with measure(stats, "report", os.path.basename(output_path)):
+                    write_json_report(sections_chi, sections_eng, output_path)
+            else:
+                generate_html_report(sections_chi, sections_eng, output_path, stats)
+
+    log_func(f"Report: {output_path}")
+    if stats is not None and (args.timing or args.memory):
+        for line in stats.format_table():
+            print(line)
+    if stats is not None and args.stats_json:
+        with open(args.stats_json, "w", encoding="utf-8") as f:
+            json.dump(stats.to_dict(), f, ensure_ascii=False, indent=2)
+    if args.profile:
+        print(f"Profile: {args.profile}")
+    return 0
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    # Run the imported module, not __main__: sections pickled by the CLI (cache entries,
+    # worker results) then refer to check_docx_engine.* like those of the GUI and the API
+    from check_docx_engine import main as _module_main
+    sys.exit(_module_main())
@@ -0,0 +1,309 @@
+"""
+Alignment of bold/underline items between the Chinese and English documents.
+
+Translated items rarely share words, but they do share cheap "anchors":
+numbers (thousands separators dropped), dates (normalized to Y-M-D from both
+"2024年3月1日" and "1 March 2024"), Latin acronyms and codes that the Chinese
+text keeps as-is ("HKIS", "SOR-1"), and quotation marks around defined terms.
+align_items() runs a banded global alignment (Needleman-Wunsch restricted to a
+strip around the diagonal) that pairs items with shared anchors, keeps items
+without anchors paired in order as before, and turns items whose anchors
+contradict into one-sided rows instead of shifting every row after them.
+
+Cost is O((n + m) * band), so sections with thousands of items align in a
+fraction of a second.
+
+align_sections() uses the same alignment one level up, pairing whole sections
+by title ordinal, item counts, shared anchors and text length so a Part
+missing from one document does not shift every Part after it.
+"""
+import itertools
+import re
+import unicodedata
+
+# Row kinds produced by align_items()
+ALIGN_MATCH = "match"        # Chinese and English item side by side
+ALIGN_CHI_ONLY = "chi_only"  # Chinese item with no English counterpart
+ALIGN_ENG_ONLY = "eng_only"  # English item with no Chinese counterpart
+
+# Half-width of the DP strip around the diagonal, in items
+ALIGN_BAND = 32
+# Scores: skipping an item, and pairing two items whose anchors share nothing.
+# Pairing with shared anchors scores 1..2; pairing when either side has no anchors scores 0.
+GAP_SCORE = -0.4
+MISMATCH_SCORE = -1.0
+
+# Date tables, shared with docx_figures. Month name or abbreviation (lower case) -> number
+MONTHS = {
+    name: number
+    for number, names in enumerate((
+        ("january", "jan"), ("february", "feb"), ("march", "mar"), ("april", "apr"),
+        ("may",), ("june", "jun"), ("july", "jul"), ("august", "aug"),
+        ("september", "sep", "sept"), ("october", "oct"), ("november", "nov"), ("december", "dec"),
+    ), 1)
+    for name in names
+}
+_ORDINAL = r"(?:st|nd|rd|th)?"
+
+# Each pattern captures (year, month, day) in named groups; day may be missing.
+# Month names are matched as any capitalized word and checked against MONTHS
+# afterwards, which is much faster than a case-insensitive alternation at every word.
+# Patterns with a day come first, so "1 March 2024" is never read as "March 2024".
+DATE_PATTERNS = [
+    re.compile(r"(?P<y>\d{4})\s*年\s*(?P<m>\d{1,2})\s*月(?:\s*(?P<d>\d{1,2})\s*日)?"),
+    re.compile(r"(?<!\d)(?P<y>\d{4})[-/.](?P<m>\d{1,2})[-/.](?P<d>\d{1,2})(?!\d)"),
+    re.compile(r"(?<!\d)(?P<d>\d{1,2})/(?P<m>\d{1,2})/(?P<y>\d{4})(?!\d)"),
+    re.compile(rf"(?<!\d)(?P<d>\d{{1,2}}){_ORDINAL}\s+(?P<mn>[A-Z][A-Za-z]{{2,8}})\.?,?\s+(?P<y>\d{{4}})(?!\d)"),
+    re.compile(rf"(?<![A-Za-z])(?P<mn>[A-Z][A-Za-z]{{2,8}})\.?\s+(?P<d>\d{{1,2}}){_ORDINAL},?\s+(?P<y>\d{{4}})(?!\d)"),
+    # Month and year only ("May 2024", like 2024年5月). Only real month names match here,
+    # so "Year 2024" or "Mayor 2024" are left to be read as numbers.
+    re.compile(r"(?<![A-Za-z])(?P<mn>Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|June?|July?|Aug(?:ust)?"
+               r"|Sep(?:t(?:ember)?)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)(?![A-Za-z])\.?,?\s+(?P<y>\d{4})(?!\d)"),
+]
+# (digit lookarounds rather than \b: CJK characters count as word characters)
+_NUMBER_RE = re.compile(r"\d+(?:,\d{3})*(?:\.\d+)?")
+# Latin tokens with a capital or digit after their first letters; plain words never match
+_LATIN_CODE_RE = re.compile(r"(?<![A-Za-z0-9])[A-Za-z][a-z]*[A-Z0-9][A-Za-z0-9]*(?:[-&.][A-Za-z0-9]+)*")
+_QUOTE_CHARS = set('"“”「」『』')
+
+def normalize_number(token):
+    """'1,000.50' -> '1000.5', '2.00' -> '2'."""
+    token = token.replace(",", "")
+    if "." in token:
+        token = token.rstrip("0").rstrip(".")
+    return token or "0"
+
+def _date_key(match):
+    """'date:Y-M-D' for a DATE_PATTERNS match (D = 0 when absent), or None if the month word is not a month."""
+    groups = match.groupdict()
+    if groups.get("mn"):
+        month = MONTHS.get(groups["mn"].lower())
+        if month is None:
+            return None
+    else:
+        month = int(groups["m"])
+    day = int(groups["d"]) if groups.get("d") else 0
+    return f"date:{int(groups['y'])}-{month}-{day}"
+
+def extract_anchors(text):
+    """Set of anchor keys for one item text (empty when it has nothing language-neutral)."""
+    text = unicodedata.normalize("NFKC", text)
+    anchors = set()
+
+    # Dates first, then blank them so their digits are not counted as numbers too
+    def take_date(match):
+        key = _date_key(match)
+        if key is None:
+            return match.group()
+        anchors.add(key)
+        return " "
+    for pattern in DATE_PATTERNS:
+        text = pattern.sub(take_date, text)
+
+    # Acronyms and codes only: at least two capitals or digits ("HKIS", "SOR-1", "B2"),
+    # so ordinary English words do not make every English item look anchored
+    def take_code(match):
+        token = match.group()
+        if sum(ch.isupper() or ch.isdigit() for ch in token) < 2:
+            return token
+        anchors.add("lat:" + token.lower())
+        return " "
+    text = _LATIN_CODE_RE.sub(take_code, text)
+
+    anchors.update("num:" + normalize_number(token) for token in _NUMBER_RE.findall(text))
+
+    if not _QUOTE_CHARS.isdisjoint(text):
+        anchors.add("quoted")
+    return anchors
+
+def _pair_score(anchors_c, anchors_e):
+    if not anchors_c or not anchors_e:
+        return 0.0
+    shared = len(anchors_c & anchors_e)
+    if not shared:
+        return MISMATCH_SCORE
+    return 1.0 + 2.0 * shared / (len(anchors_c) + len(anchors_e))
+
+def padded_rows(list_c, list_e):
+    """Index pairing (the shorter side padded), as the report did before alignment."""
+    rows = []
+    for item_c, item_e in itertools.zip_longest(list_c, list_e):
+        if item_c is None:
+            rows.append((ALIGN_ENG_ONLY, None, item_e))
+        elif item_e is None:
+            rows.append((ALIGN_CHI_ONLY, item_c, None))
+        else:
+            rows.append((ALIGN_MATCH, item_c, item_e))
+    return rows
+
+def _monotone_alignment(n, m, pair_score, gap_score, band=None):
+    """
+    Global alignment of sequences of length n and m (Needleman-Wunsch), restricted to
+    `band` cells either side of the scaled diagonal when band is given.
+    pair_score(i, j) scores pairing element i with element j. Returns [(i or None, j or None)].
+    """
+    # Strip around the scaled diagonal j ~ i * m / n, widened by the slope so rows stay connected
+    width = m if band is None else band + -(-m // n)
+    bounds = []
+    for i in range(n + 1):
+        center = i * m // n
+        bounds.append((max(0, center - width), min(m, center + width)))
+
+    NEG = float("-inf")
+    moves = []  # per row: bytearray of 0 = diagonal, 1 = first sequence only, 2 = second only
+    lo, hi = bounds[0]
+    prev = [j * gap_score for j in range(lo, hi + 1)]
+    prev_lo, prev_hi = lo, hi
+    moves.append(bytearray([2] * (hi - lo + 1)))
+
+    for i in range(1, n + 1):
+        lo, hi = bounds[i]
+        row = [NEG] * (hi - lo + 1)
+        row_moves = bytearray(hi - lo + 1)
+        for j in range(lo, hi + 1):
+            best, move = NEG, 0
+            if prev_lo <= j - 1 <= prev_hi and j >= 1:
+                best = prev[j - 1 - prev_lo] + pair_score(i - 1, j - 1)
+            # Ties go to the gap, so the traceback (from the end) leaves unmatched
+            # elements as late as possible, like the old padding
+            if prev_lo <= j <= prev_hi:
+                score = prev[j - prev_lo] + gap_score
+                if score >= best:
+                    best, move = score, 1
+            if j - 1 >= lo:
+                score = row[j - 1 - lo] + gap_score
+                if score >= best:
+                    best, move = score, 2
+            row[j - lo] = best
+            row_moves[j - lo] = move
+        moves.append(row_moves)
+        prev, prev_lo, prev_hi = row, lo, hi
+
+    pairs = []
+    i, j = n, m
+    while i > 0 or j > 0:
+        move = moves[i][j - bounds[i][0]] if i > 0 else 2
+        if move == 0:
+            pairs.append((i - 1, j - 1))
+            i, j = i - 1, j - 1
+        elif move == 1:
+            pairs.append((i - 1, None))
+            i -= 1
+        else:
+            pairs.append((None, j - 1))
+            j -= 1
+    pairs.reverse()
+    return pairs
+
+def _rows(pairs, list_c, list_e):
+    return [
+        (ALIGN_MATCH if i is not None and j is not None else ALIGN_CHI_ONLY if j is None else ALIGN_ENG_ONLY,
+         list_c[i] if i is not None else None,
+         list_e[j] if j is not None else None)
+        for i, j in pairs
+    ]
+
+def align_items(list_c, list_e, band=ALIGN_BAND, text=lambda item: item.text):
+    """
+    Align two item lists; returns [(kind, item_c or None, item_e or None)] in order,
+    kind being ALIGN_MATCH, ALIGN_CHI_ONLY or ALIGN_ENG_ONLY.
+    """
+    anchors_c = [extract_anchors(text(item)) for item in list_c]
+    anchors_e = [extract_anchors(text(item)) for item in list_e]
+    n, m = len(list_c), len(list_e)
+    if not n or not m or not any(anchors_c) or not any(anchors_e):
+        return padded_rows(list_c, list_e)
+    pairs = _monotone_alignment(
+        n, m, lambda i, j: _pair_score(anchors_c[i], anchors_e[j]), GAP_SCORE, band)
+    return _rows(pairs, list_c, list_e)
+
+# ==========================================
+# Section alignment
+# ==========================================
+
+_CHI_ORDINALS = "甲乙丙丁戊己庚辛壬癸"
+_CHI_ORDINAL_RE = re.compile(rf"\s*[(（]?\s*([{_CHI_ORDINALS}])")
+_PART_LETTER_RE = re.compile(r"\s*Part\s+([A-Z])\b", re.IGNORECASE)
+# "Part 12", or a bare short number followed by ".", ")" or a space and then text
+# ("1. General", "2) Scope"); "2024 Annual Fees" or "1.2 Terms" are not ordinals
+_PART_NUMBER_RE = re.compile(r"\s*(?:Part\s+(\d+)\b|(\d{1,3})(?:[.)]|\s)\s*(?=\D))", re.IGNORECASE)
+
+# Section pair scoring: ordinal agreement dominates; the other features are similarities in 0..1
+SECTION_ORDINAL_MATCH = 3.0
+SECTION_ORDINAL_MISMATCH = -6.0
+SECTION_BASELINE = -1.5
+SECTION_GAP_SCORE = -1.0
+
+def section_ordinal(title):
+    """Position encoded in a section title: 甲 / Part A / Part 1 -> 1, or None."""
+    title = unicodedata.normalize("NFKC", title)
+    match = _CHI_ORDINAL_RE.match(title)
+    if match:
+        return _CHI_ORDINALS.index(match.group(1)) + 1
+    match = _PART_LETTER_RE.match(title)
+    if match:
+        return ord(match.group(1).upper()) - ord("A") + 1
+    match = _PART_NUMBER_RE.match(title)
+    if match:
+        return int(match.group(1) or match.group(2))
+    return None
+
+def _own_features(section):
+    # Anchors of the formatted items only: they carry the key figures and are a small
+    # fraction of the text, which keeps the whole stage in the millisecond range
+    item_texts = [item.text for items in section.formatted_data.values() for item in items]
+    anchors = extract_anchors("\n".join(item_texts))
+    anchors.discard("quoted")
+    return (
+        section_ordinal(section.title),
+        sum(len(items) for items in section.formatted_data.values()),
+        anchors,
+        sum(len(block) for block in section.content_blocks),
+    )
+
+def section_features(sections, cache=None):
+    """
+    (ordinal, item count, item anchor set, share of the document's text) for each section.
+    cache, if given, is a dict keyed by section.digest() reused across calls.
+    """
+    own = []
+    for section in sections:
+        if cache is None:
+            own.append(_own_features(section))
+            continue
+        digest = section.digest()
+        if digest not in cache:
+            cache[digest] = _own_features(section)
+        own.append(cache[digest])
+    total_length = sum(length for *_, length in own) or 1
+    return [(ordinal, count, anchors, length / total_length) for ordinal, count, anchors, length in own]
+
+def _ratio(a, b):
+    return 1.0 - abs(a - b) / max(a, b) if max(a, b) else 1.0
+
+def _section_score(features_c, features_e):
+    ordinal_c, count_c, anchors_c, share_c = features_c
+    ordinal_e, count_e, anchors_e, share_e = features_e
+    score = SECTION_BASELINE + _ratio(count_c, count_e) + _ratio(share_c, share_e)
+    if anchors_c or anchors_e:
+        score += 2.0 * len(anchors_c & anchors_e) / len(anchors_c | anchors_e)
+    if ordinal_c is not None and ordinal_e is not None:
+        score += SECTION_ORDINAL_MATCH if ordinal_c == ordinal_e else SECTION_ORDINAL_MISMATCH
+    return score
+
+def align_sections(sections_chi, sections_eng, feature_cache=None):
+    """
+    Pair the sections of both documents in order; returns [(kind, section_c or None,
+    section_e or None)] like align_items(). Sections are matched on their title
+    ordinal (甲/乙/丙 vs Part A/B/C), item counts, numbers/dates/codes shared by their
+    items and share of the document text; a Part missing on one side becomes a one-sided row.
+    feature_cache is passed on to section_features().
+    """
+    n, m = len(sections_chi), len(sections_eng)
+    if not n or not m:
+        return padded_rows(sections_chi, sections_eng)
+    features_c = section_features(sections_chi, feature_cache)
+    features_e = section_features(sections_eng, feature_cache)
+    pairs = _monotone_alignment(
+        n, m, lambda i, j: _section_score(features_c[i], features_e[j]), SECTION_GAP_SCORE)
+    return _rows(pairs, sections_chi, sections_eng)
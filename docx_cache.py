@@ -0,0 +1,121 @@
+"""
+Persistent cache of parsed DocumentSection lists.
+
+Entries are keyed by the SHA-256 of the .docx bytes plus every parameter that
+affects parsing (TOC keyword, title regex, backend, style resolution) and the
+engine version, so a renamed or touched-but-unchanged file still hits and any
+edit or engine upgrade misses. Values are pickled section lists. The cache
+directory is kept under a byte budget by evicting least-recently-used entries
+(access time is tracked with the file mtime, which is bumped on every hit).
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+_ENTRY_SUFFIX = ".sections.pkl"
+
+def default_cache_dir():
+    base = (
+        os.environ.get("LOCALAPPDATA")
+        or os.environ.get("XDG_CACHE_HOME")
+        or os.path.join(os.path.expanduser("~"), ".cache")
+    )
+    return os.path.join(base, "docx-bilingual-auditor", "sections")
+
+def file_digest(file_path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class SectionCache:
+    """Size-bounded LRU cache of parse results on disk. Safe to share between processes."""
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.max_bytes = max_bytes
+
+    def make_key(self, file_path, *params):
+        """Content hash of file_path combined with the parse parameters."""
+        digest = hashlib.sha256(file_digest(file_path).encode("ascii"))
+        for param in params:
+            digest.update(b"\0" + repr(param).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, key + _ENTRY_SUFFIX)
+
+    def __contains__(self, key):
+        return os.path.exists(self._entry_path(key))
+
+    def get(self, key):
+        """Returns the cached sections, or None on a miss or unreadable entry."""
+        path = self._entry_path(key)
+        try:
+            with open(path, "rb") as f:
+                sections = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            pass
+        return sections
+
+    def put(self, key, sections):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(sections, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._entry_path(key))
+        except Exception:
+            self._remove(tmp_path)
+            raise
+        self.evict()
+
+    def evict(self):
+        """Delete least-recently-used entries until the cache fits in max_bytes."""
+        entries = []
+        total = 0
+        try:
+            names = os.listdir(self.cache_dir)
+        except FileNotFoundError:
+            return
+        for name in names:
+            if not name.endswith(_ENTRY_SUFFIX):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    def clear(self):
+        self.max_bytes, max_bytes = 0, self.max_bytes
+        try:
+            self.evict()
+        finally:
+            self.max_bytes = max_bytes
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,180 @@
+"""
+Cross-check of figures (amounts, percentages, dates, clause numbers) between
+aligned Chinese and English sections.
+
+Each section's content_blocks are scanned once with a single combined regex.
+Every figure is normalized to a language-neutral key:
+
+    num:50000     50,000 / 5萬 / 五萬 / $0.05 million (full-width digits too)
+    pct:5         5% / 5 per cent / 百分之五
+    date:2024-3-1 2024年3月1日 / 二〇二四年三月一日 / 1 March 2024 / 2024-03-01
+    date:2024-5-0 2024年5月 / May 2024 (no day)
+    ref:3.2.1     clause and item numbers with two or more dots
+
+The two sections' key multisets are then diffed, so a figure that appears
+more often on one side is reported along with the first paragraph that
+contains it (for the report's copy-context button).
+
+Chinese numerals are only read where they are clearly numbers: after 第 or
+百分之, before a unit such as 日/月/年/條/元, or three or more numeral
+characters long. This keeps words like 一般 or 千萬 out. English number
+words are not converted.
+"""
+import collections
+import re
+import unicodedata
+from decimal import Decimal, InvalidOperation
+
+from docx_align import DATE_PATTERNS, MONTHS
+
+_CHI_DIGITS = {
+    '〇': 0, '零': 0, '一': 1, '壹': 1, '二': 2, '貳': 2, '兩': 2, '两': 2, '三': 3, '參': 3, '叁': 3,
+    '四': 4, '肆': 4, '五': 5, '伍': 5, '六': 6, '陸': 6, '七': 7, '柒': 7, '八': 8, '捌': 8, '九': 9, '玖': 9,
+}
+_CHI_SMALL_UNITS = {'十': 10, '拾': 10, '百': 100, '佰': 100, '千': 1000, '仟': 1000}
+_CHI_BIG_UNITS = {'萬': 10 ** 4, '万': 10 ** 4, '億': 10 ** 8, '亿': 10 ** 8}
+_CHI_NUMERAL_CHARS = "".join(_CHI_DIGITS) + "".join(_CHI_SMALL_UNITS) + "".join(_CHI_BIG_UNITS)
+# Characters after a Chinese numeral that mark it as a quantity
+_CHI_UNIT_CHARS = "日天月年週周條款段頁次元%"
+_CHI_YEAR_DIGITS = "〇零一二三四五六七八九"
+_CHI_SMALL_NUMERAL = "一二三四五六七八九十"
+
+_MULTIPLIERS = {'萬': 10 ** 4, '万': 10 ** 4, '億': 10 ** 8, '亿': 10 ** 8, 'million': 10 ** 6, 'billion': 10 ** 9}
+
+def _date_alternative(idx, pattern):
+    source = re.sub(r"\(\?P<(\w+)>", lambda m: f"(?P<{m.group(1)}{idx}>", pattern.pattern)
+    return f"(?P<date{idx}>{source})"
+
+# Alternatives are tried left to right at each position, so dates win over their digits.
+# The leading lookahead skips positions no alternative can start at without trying them all.
+_FIGURE_RE = re.compile(rf"(?=[\dA-Z{_CHI_NUMERAL_CHARS}百第])(?:" + "|".join(
+    [_date_alternative(idx, pattern) for idx, pattern in enumerate(DATE_PATTERNS)] + [
+        # 二〇二四年三月(一日), tried before the plain Chinese numerals below
+        rf"(?P<chi_date>(?P<chi_date_y>[{_CHI_YEAR_DIGITS}]{{4}})\s*年\s*(?P<chi_date_m>[{_CHI_SMALL_NUMERAL}]{{1,2}})\s*月"
+        rf"(?:\s*(?P<chi_date_d>[{_CHI_SMALL_NUMERAL}]{{1,3}})\s*日)?)",
+        r"(?P<pct>(?P<pct_value>\d+(?:\.\d+)?)\s*(?:%|[Pp]er\s*cent\b|[Pp]ercent\b))",
+        rf"(?P<pct_chi>百分之(?P<pct_chi_value>[{_CHI_NUMERAL_CHARS}]+|\d+(?:\.\d+)?))",
+        r"(?P<ref>(?<![\d.])\d+(?:\.\d+){2,}(?!\d))",
+        r"(?P<num>(?P<num_value>\d+(?:,\d{3})*(?:\.\d+)?)(?:\s*(?P<num_mult>[萬万億亿]|[Mm]illion\b|[Bb]illion\b))?)",
+        rf"(?P<chi>(?P<chi_pre>第)?(?P<chi_value>[{_CHI_NUMERAL_CHARS}]+)(?=(?P<chi_unit>[{_CHI_UNIT_CHARS}])?))",
+    ]
+) + ")")
+
+def chinese_numeral_value(text):
+    """'三萬五千' -> 35000, '二〇二四' -> 2024, '十二' -> 12."""
+    if not any(ch in _CHI_SMALL_UNITS or ch in _CHI_BIG_UNITS for ch in text):
+        # Digit by digit, as in years
+        return int("".join(str(_CHI_DIGITS[ch]) for ch in text))
+    total = section = number = 0
+    for ch in text:
+        if ch in _CHI_DIGITS:
+            number = _CHI_DIGITS[ch]
+        elif ch in _CHI_SMALL_UNITS:
+            section += (number or 1) * _CHI_SMALL_UNITS[ch]
+            number = 0
+        else:
+            unit = _CHI_BIG_UNITS[ch]
+            chunk = section + number or 1
+            if total and total < unit:
+                total = (total + chunk) * unit  # 十萬億: the smaller amount scales up
+            else:
+                total += chunk * unit           # 一億二千萬: 1e8 + 2000 * 1e4
+            section = number = 0
+    return total + section + number
+
+def _decimal_text(value):
+    """Decimal without exponent or trailing zeros: Decimal('50000.00') -> '50000'."""
+    text = format(value.normalize(), "f")
+    return text.rstrip("0").rstrip(".") if "." in text else text
+
+def _figure_key(match):
+    kind = match.lastgroup
+    if kind.startswith("date"):
+        idx = kind[4:]
+        groups = {name[:-len(idx)]: value for name, value in match.groupdict().items()
+                  if name.endswith(idx) and name != kind and value is not None}
+        if "mn" in groups:
+            month = MONTHS.get(groups["mn"].lower())
+            if month is None:
+                return None
+        else:
+            month = int(groups["m"])
+        return f"date:{int(groups['y'])}-{month}-{int(groups.get('d') or 0)}"
+    if kind == "chi_date":
+        day = match.group("chi_date_d")
+        return (f"date:{chinese_numeral_value(match.group('chi_date_y'))}-"
+                f"{chinese_numeral_value(match.group('chi_date_m'))}-{chinese_numeral_value(day) if day else 0}")
+    if kind == "pct":
+        return "pct:" + _decimal_text(Decimal(match.group("pct_value")))
+    if kind == "pct_chi":
+        value = match.group("pct_chi_value")
+        return "pct:" + (_decimal_text(Decimal(value)) if value[0].isdigit() else str(chinese_numeral_value(value)))
+    if kind == "ref":
+        return "ref:" + match.group()
+    if kind == "num":
+        value = Decimal(match.group("num_value").replace(",", ""))
+        multiplier = match.group("num_mult")
+        if multiplier:
+            value *= _MULTIPLIERS[multiplier.lower()]
+        return "num:" + _decimal_text(value)
+    value = match.group("chi_value")
+    if not (match.group("chi_pre") or match.group("chi_unit") or len(value) >= 3):
+        return None
+    return f"num:{chinese_numeral_value(value)}"
+
+def extract_figures(text):
+    """Figure keys in text, in order of appearance."""
+    keys = []
+    for match in _FIGURE_RE.finditer(unicodedata.normalize("NFKC", text)):
+        try:
+            key = _figure_key(match)
+        except (InvalidOperation, KeyError, ValueError):
+            continue
+        if key is not None:
+            keys.append(key)
+    return keys
+
+def section_figures(section):
+    """(Counter of figure keys, {key: first content block containing it}) for a DocumentSection."""
+    counts = collections.Counter()
+    first_context = {}
+    for block in section.content_blocks:
+        for key in extract_figures(block):
+            counts[key] += 1
+            first_context.setdefault(key, block)
+    return counts, first_context
+
+def figure_label(key):
+    """Display form of a figure key: 'pct:5' -> '5%', 'date:2024-3-1' -> '2024-03-01'."""
+    kind, _, value = key.partition(":")
+    if kind == "pct":
+        return value + "%"
+    if kind == "date":
+        year, month, day = value.split("-")
+        return f"{year}-{int(month):02d}" + (f"-{int(day):02d}" if day != "0" else "")
+    if kind == "num" and "." not in value and len(value) > 3:
+        return f"{int(value):,}"
+    return value
+
+def diff_figures(section_c, section_e):
+    """
+    Figures whose count differs between the two sections (either may be None).
+    Returns (chinese_only, english_only) as lists of item dicts
+    {'text': label (xN when repeated), 'context': first block, 'key': key, 'count': N}.
+    """
+    counts_c, contexts_c = section_figures(section_c) if section_c else (collections.Counter(), {})
+    counts_e, contexts_e = section_figures(section_e) if section_e else (collections.Counter(), {})
+
+    def items(extra, contexts):
+        result = []
+        for key, count in extra.items():
+            label = figure_label(key)
+            result.append({
+                'text': label if count == 1 else f"{label} (x{count})",
+                'context': contexts[key],
+                'key': key,
+                'count': count,
+            })
+        return result
+
+    return items(counts_c - counts_e, contexts_c), items(counts_e - counts_c, contexts_e)
@@ -0,0 +1,249 @@
+"""
+Raw-XML streaming backend for check_docx_engine.parse_document_sections.
+
+Instead of building a python-docx Document (which loads every part of the
+package, including embedded media, into memory), this backend opens the .docx
+zip and streams word/document.xml with lxml.iterparse. Each top-level
+paragraph/table is processed as soon as it is complete and then cleared, so
+peak memory is bounded by the largest single block rather than the document.
+
+The text and formatting rules mirror python-docx (Paragraph.text, Run.bold,
+Run.underline, _Row.cells) so both backends produce the same DocumentSection
+output.
+"""
+import zipfile
+
+from lxml import etree
+
+from check_docx_engine import TABLE_HEADER_XPATH, collect_run_spans, format_table_text
+from docx_styles import (
+    W_NS, XML_RUN_ATTRIBUTES, StyleResolver, W_RPR, W_VAL, _w, paragraph_outline, paragraph_style_id,
+    run_style_id,
+)
+
+_NSMAP = {'w': W_NS}
+
+W_BODY = _w("body")
+W_P = _w("p")
+W_TBL = _w("tbl")
+W_TR = _w("tr")
+W_TC = _w("tc")
+W_R = _w("r")
+W_HYPERLINK = _w("hyperlink")
+W_TRPR = _w("trPr")
+W_TCPR = _w("tcPr")
+W_TYPE = _w("type")
+
+# Body-level elements that are cleared after use. w:p and w:tbl are the only
+# blocks the engine reads; the others are listed so large wrappers (content
+# controls, custom XML) are released too.
+_BODY_CHILD_TAGS = (W_P, W_TBL, _w("sdt"), _w("customXml"))
+
+# Text equivalents of run inner-content, as in docx.oxml.text.run.CT_R.text
+_RUN_TEXT_TAGS = {
+    _w("tab"): "\t",
+    _w("ptab"): "\t",
+    _w("cr"): "\n",
+    _w("noBreakHyphen"): "-",
+}
+W_T = _w("t")
+W_BR = _w("br")
+
+# ==========================================
+# Block scanning
+# ==========================================
+
+def _run_text(r):
+    parts = []
+    for child in r:
+        tag = child.tag
+        if tag == W_T:
+            parts.append(child.text or "")
+        elif tag == W_BR:
+            parts.append("\n" if child.get(W_TYPE, "textWrapping") == "textWrapping" else "")
+        else:
+            text = _RUN_TEXT_TAGS.get(tag)
+            if text:
+                parts.append(text)
+    return "".join(parts)
+
+def scan_paragraph(p, items_by_attr, attributes, resolver=None):
+    """
+    Returns the raw paragraph text and fills items_by_attr, walking each run once.
+    With a resolver, attributes must already be wrapped by resolver.wrap().
+    """
+    p_style = paragraph_style_id(p) if resolver is not None else None
+    pieces = []
+    run_values = []
+    for child in p:
+        if child.tag == W_R:
+            text = _run_text(child)
+            pieces.append(text)
+            rPr = child.find(W_RPR)
+            if resolver is None:
+                run_values.append((text, rPr))
+            else:
+                r_style = run_style_id(child) if rPr is not None else None
+                run_values.append((text, (rPr, resolver.run_properties(p_style, r_style))))
+        elif child.tag == W_HYPERLINK:
+            # Hyperlink text counts towards the context but, as with para.runs,
+            # its runs are not candidates for formatted items.
+            for r in child.iterchildren(W_R):
+                pieces.append(_run_text(r))
+
+    raw_text = "".join(pieces)
+    para_text = raw_text.strip()
+    if para_text:
+        collect_run_spans(run_values, para_text, items_by_attr, attributes)
+    return raw_text
+
+def _int_prop(parent, pr_tag, tag, default):
+    pr = parent.find(pr_tag)
+    if pr is None:
+        return default
+    element = pr.find(_w(tag))
+    if element is None:
+        return default
+    try:
+        return int(element.get(W_VAL))
+    except (TypeError, ValueError):
+        return default
+
+def _v_merge(tc):
+    tcPr = tc.find(W_TCPR)
+    if tcPr is None:
+        return None
+    element = tcPr.find(_w("vMerge"))
+    if element is None:
+        return None
+    return element.get(W_VAL, "continue")
+
+def iter_table_rows(tbl, attributes, resolver=None):
+    """
+    Yields one list per w:tr with a (cell_text, cell_items) entry per layout-grid
+    cell, following _Row.cells: horizontally spanned cells repeat, and vertically
+    merged continuation cells resolve to the cell where the merge started.
+    """
+    cell_cache = {}
+    grid_above = {}
+    for tr in tbl.iterchildren(W_TR):
+        row_cells = []
+        grid = {}
+        offset = _int_prop(tr, W_TRPR, "gridBefore", 0)
+        for tc in tr.iterchildren(W_TC):
+            span = _int_prop(tc, W_TCPR, "gridSpan", 1)
+            root = tc
+            if _v_merge(tc) == "continue" and offset in grid_above:
+                root = grid_above[offset]
+            grid[offset] = root
+
+            cached = cell_cache.get(root)
+            if cached is None:
+                cell_items = {name: [] for name in attributes}
+                cell_text = "\n".join(
+                    scan_paragraph(p, cell_items, attributes, resolver) for p in root.iterchildren(W_P)
+                )
+                cached = (cell_text, cell_items)
+                cell_cache[root] = cached
+            root_span = span if root is tc else _int_prop(root, W_TCPR, "gridSpan", 1)
+            row_cells.extend([cached] * root_span)
+            offset += span
+        grid_above = grid
+        yield row_cells
+
+def scan_table(tbl, attributes, resolver=None):
+    items_by_attr = {name: [] for name in attributes}
+    rows_text = []
+    first_row_text = ""
+    for row_idx, row_cells in enumerate(iter_table_rows(tbl, attributes, resolver)):
+        row_data = []
+        for cell_text, cell_items in row_cells:
+            for name, item_list in cell_items.items():
+                items_by_attr[name].extend(item_list)
+            row_data.append(cell_text.strip())
+        if row_idx == 0:
+            first_row_text = " ".join(row_data)
+        rows_text.append(" | ".join(row_data))
+    return first_row_text, format_table_text(rows_text), items_by_attr
+
+# ==========================================
+# Streaming reader
+# ==========================================
+
+class StreamingDocxBackend:
+    """Backend for parse_document_sections(..., backend="stream")."""
+
+    def __init__(self, file_path, resolve_styles=True):
+        self.file_path = file_path
+        # Fail early (inside parse_document_sections' error handling) on bad packages
+        with zipfile.ZipFile(file_path) as zf:
+            zf.getinfo("word/document.xml")
+            styles_element = None
+            if "word/styles.xml" in zf.namelist():
+                parser = etree.XMLParser(remove_blank_text=True, resolve_entities=False)
+                styles_element = etree.fromstring(zf.read("word/styles.xml"), parser)
+        # Style table is always read (outline levels); run inheritance only when resolve_styles
+        self.styles = StyleResolver(styles_element)
+        self.resolver = self.styles if resolve_styles else None
+        self._stream = None
+
+    def scan_progress(self):
+        """
+        Fraction of word/document.xml read by the current iter_body_elements() pass.
+        The block count is unknown until the stream ends, so uncompressed bytes stand in for it.
+        """
+        if self._stream is None:
+            return 0.0
+        fh, size = self._stream
+        if fh.closed or not size:
+            return 1.0
+        return fh.tell() / size
+
+    def iter_body_elements(self):
+        """Yields each complete top-level w:p / w:tbl, clearing it once the consumer moves on."""
+        with zipfile.ZipFile(self.file_path) as zf, zf.open("word/document.xml") as fh:
+            self._stream = (fh, zf.getinfo("word/document.xml").file_size)
+            events = etree.iterparse(
+                fh, events=("end",), tag=_BODY_CHILD_TAGS,
+                remove_blank_text=True, resolve_entities=False, huge_tree=True,
+            )
+            for _, element in events:
+                parent = element.getparent()
+                if parent is None or parent.tag != W_BODY:
+                    continue
+                if element.tag in (W_P, W_TBL):
+                    yield element
+                element.clear(keep_tail=True)
+                # Drop everything already processed (including small body-level
+                # elements such as bookmarks that never reach this branch).
+                while element.getprevious() is not None:
+                    del parent[0]
+
+    def iter_table_headers(self):
+        """Yields (header_check, first_column_texts) for every top-level table."""
+        for element in self.iter_body_elements():
+            if element.tag != W_TBL:
+                continue
+            header_check = "".join(element.xpath(TABLE_HEADER_XPATH, namespaces=_NSMAP))
+
+            def first_column_texts(tbl=element):
+                # Called before the stream moves on, while the table is still in memory
+                for row in iter_table_rows(tbl, {}):
+                    if not row: continue
+                    yield row[0][0]
+
+            yield header_check, first_column_texts
+
+    def iter_blocks(self, attributes=XML_RUN_ATTRIBUTES, with_outline=False):
+        """Yields (text_for_title_check, full_content, items_by_attr, outline) like PythonDocxBackend."""
+        resolver = self.resolver
+        if resolver is not None:
+            attributes = resolver.wrap(attributes)
+        for element in self.iter_body_elements():
+            if element.tag == W_P:
+                items_by_attr = {name: [] for name in attributes}
+                block_text = scan_paragraph(element, items_by_attr, attributes, resolver).strip()
+                outline = paragraph_outline(element, self.styles) if with_outline else None
+                yield block_text, block_text, items_by_attr, outline
+            else:
+                yield (*scan_table(element, attributes, resolver), None)
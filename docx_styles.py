@@ -0,0 +1,239 @@
+"""
+Style inheritance for run formatting.
+
+Run.bold / Run.underline only report direct formatting, so text that is bold
+because of its paragraph or character style is missed. StyleResolver reads
+word/styles.xml once, resolves every style's basedOn chain against the
+document defaults up front, and caches the combination for each
+(paragraph style, character style) pair, so the per-run cost of inheritance is
+a single dict lookup.
+
+Precedence follows Word for the common case: direct formatting, then the
+character style, then the paragraph style, then docDefaults. Toggle-property
+XOR between style layers and table-style conditional formatting are not
+modelled.
+
+The resolver also knows each paragraph style's outline level (Heading 1 = 0),
+which the heading-based sectioning mode uses.
+"""
+import re
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+def _w(tag):
+    return f"{{{W_NS}}}{tag}"
+
+W_VAL = _w("val")
+W_RPR = _w("rPr")
+W_PPR = _w("pPr")
+W_OUTLINE_LVL = _w("outlineLvl")
+W_BOOKMARK_START = _w("bookmarkStart")
+W_NAME = _w("name")
+
+# Built-in heading style names, used when a style has no explicit w:outlineLvl
+_HEADING_NAME = re.compile(r"^heading ([1-9])$", re.IGNORECASE)
+
+# ==========================================
+# Run property readers (XML equivalents of RUN_ATTRIBUTES)
+# ==========================================
+
+def _on_off(rPr, tag):
+    """Tri-state value of a w:b-like toggle element, as CT_OnOff.val."""
+    if rPr is None:
+        return None
+    element = rPr.find(tag)
+    if element is None:
+        return None
+    val = element.get(W_VAL)
+    return True if val is None else val in ("1", "true", "on")
+
+def rpr_bold(rPr):
+    return _on_off(rPr, _w("b"))
+
+def rpr_underline(rPr):
+    """Same truthiness as Run.underline: 'single' -> True, 'none' -> False, other styles truthy."""
+    if rPr is None:
+        return None
+    element = rPr.find(_w("u"))
+    if element is None:
+        return None
+    val = element.get(W_VAL)
+    if val is None:
+        return None
+    if val == "single":
+        return True
+    if val == "none":
+        return False
+    return val
+
+# Each reader takes a w:rPr element (or None) and returns None when the
+# property is not set at that level.
+XML_RUN_ATTRIBUTES = {
+    'bold': rpr_bold,
+    'underline': rpr_underline,
+}
+
+def _child_val(parent, pr_tag, tag):
+    if parent is None:
+        return None
+    pr = parent.find(pr_tag)
+    if pr is None:
+        return None
+    element = pr.find(_w(tag))
+    if element is None:
+        return None
+    return element.get(W_VAL)
+
+def paragraph_style_id(p):
+    """w:pPr/w:pStyle/@w:val of a w:p element, or None."""
+    return _child_val(p, W_PPR, "pStyle")
+
+def run_style_id(r):
+    """w:rPr/w:rStyle/@w:val of a w:r element, or None."""
+    return _child_val(r, W_RPR, "rStyle")
+
+def _outline_value(pPr):
+    """w:outlineLvl of a w:pPr as an int; level 9 (body text) and bad values count as unset."""
+    if pPr is None:
+        return None
+    element = pPr.find(W_OUTLINE_LVL)
+    if element is None:
+        return None
+    try:
+        level = int(element.get(W_VAL))
+    except (TypeError, ValueError):
+        return None
+    return level if 0 <= level < 9 else None
+
+def paragraph_outline(p, resolver):
+    """
+    (outline_level, is_toc_target) of a w:p element. The level comes from direct
+    w:outlineLvl or the paragraph style (None for body text). is_toc_target is True
+    when the paragraph holds a _Toc bookmark, i.e. an entry of a Word TOC field links to it.
+    """
+    level = _outline_value(p.find(W_PPR))
+    if level is None:
+        level = resolver.outline_level(paragraph_style_id(p))
+    is_toc_target = any(
+        (bookmark.get(W_NAME) or "").startswith("_Toc") for bookmark in p.iterchildren(W_BOOKMARK_START)
+    )
+    return level, is_toc_target
+
+# ==========================================
+# Resolver
+# ==========================================
+
+class StyleResolver:
+    """Effective run properties per (paragraph style, character style), computed once."""
+
+    def __init__(self, styles_element=None, attributes=XML_RUN_ATTRIBUTES):
+        self.attributes = attributes
+        self._combined = {}
+        self._wrapped = {}
+        self.default_paragraph_style = None
+        self.default_character_style = None
+
+        defaults = {name: None for name in attributes}
+        raw_styles = {}
+        raw_outline = {}
+        if styles_element is not None:
+            rPr_default = styles_element.find(f"{_w('docDefaults')}/{_w('rPrDefault')}/{W_RPR}")
+            defaults = self._read(rPr_default)
+            for style in styles_element.iterchildren(_w("style")):
+                style_id = style.get(_w("styleId"))
+                if style_id is None:
+                    continue
+                style_type = style.get(_w("type"))
+                is_default = style.get(_w("default")) in ("1", "true", "on")
+                if is_default and style_type == "paragraph":
+                    self.default_paragraph_style = style_id
+                elif is_default and style_type == "character":
+                    self.default_character_style = style_id
+                based_on = style.find(_w("basedOn"))
+                raw_styles[style_id] = (
+                    based_on.get(W_VAL) if based_on is not None else None,
+                    self._read(style.find(W_RPR)),
+                )
+                level = _outline_value(style.find(W_PPR))
+                if level is None and style_type == "paragraph":
+                    name = style.find(W_NAME)
+                    match = _HEADING_NAME.match(name.get(W_VAL, "")) if name is not None else None
+                    if match:
+                        level = int(match.group(1)) - 1
+                if level is not None:
+                    raw_outline[style_id] = level
+
+        self.defaults = defaults
+        # Properties contributed by each style's own basedOn chain (None = not set)
+        self.style_chain = {}
+        # Outline level per paragraph style, inherited through basedOn
+        self.outline_levels = {}
+        for style_id in raw_styles:
+            self._resolve_chain(style_id, raw_styles, ())
+            based_on, seen = style_id, set()
+            while based_on in raw_styles and based_on not in seen:
+                if based_on in raw_outline:
+                    self.outline_levels[style_id] = raw_outline[based_on]
+                    break
+                seen.add(based_on)
+                based_on = raw_styles[based_on][0]
+
+    def _read(self, rPr):
+        return {name: reader(rPr) for name, reader in self.attributes.items()}
+
+    def _resolve_chain(self, style_id, raw_styles, visiting):
+        if style_id in self.style_chain:
+            return self.style_chain[style_id]
+        if style_id not in raw_styles or style_id in visiting:
+            return {name: None for name in self.attributes}
+        based_on, own = raw_styles[style_id]
+        inherited = (
+            self._resolve_chain(based_on, raw_styles, visiting + (style_id,))
+            if based_on else {name: None for name in self.attributes}
+        )
+        chain = {
+            name: own[name] if own[name] is not None else inherited[name]
+            for name in self.attributes
+        }
+        self.style_chain[style_id] = chain
+        return chain
+
+    def run_properties(self, p_style_id, r_style_id):
+        """Inherited (non-direct) properties for a run, as {attribute: value}."""
+        key = (p_style_id, r_style_id)
+        props = self._combined.get(key)
+        if props is None:
+            empty = {}
+            para = self.style_chain.get(p_style_id or self.default_paragraph_style, empty)
+            char = self.style_chain.get(r_style_id or self.default_character_style, empty)
+            props = {}
+            for name in self.attributes:
+                value = char.get(name)
+                if value is None:
+                    value = para.get(name)
+                if value is None:
+                    value = self.defaults.get(name)
+                props[name] = value
+            self._combined[key] = props
+        return props
+
+    def outline_level(self, p_style_id):
+        """Outline level of a paragraph style (0 = Heading 1), or None for body text."""
+        return self.outline_levels.get(p_style_id or self.default_paragraph_style)
+
+    def wrap(self, attributes):
+        """
+        Turn direct-formatting predicates into ones that take (direct_handle, inherited)
+        pairs and fall back to the inherited value when the run sets nothing itself.
+        """
+        cached = self._wrapped.get(id(attributes))
+        if cached is None or cached[0] is not attributes:
+            def make(name, direct):
+                def predicate(handle):
+                    value = direct(handle[0])
+                    return handle[1].get(name) if value is None else value
+                return predicate
+            wrapped = {name: make(name, direct) for name, direct in attributes.items()}
+            cached = (attributes, wrapped)
+            self._wrapped[id(attributes)] = cached
+        return cached[1]
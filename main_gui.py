@@ -1,12 +1,17 @@
 import os
 import sys  # Added sys
+import queue
 import threading
+import multiprocessing
 import tkinter as tk
 from tkinter import filedialog, messagebox
 from tkinter.scrolledtext import ScrolledText
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
-from check_docx_engine import generate_html_report, parse_document_sections
+from audit_stats import AuditStats
+from docx_cache import SectionCache
+# check_docx_engine (and python-docx behind it) is imported by run_logic on first use,
+# so the window comes up before any docx machinery is loaded
 
 # --- Helper to get resource path ---
 def get_resource_path(relative_path):
@@ -33,6 +38,15 @@ def load_version():
 
 APP_VERSION = load_version()
 
+# Log lines are queued by any thread and written to the widget in batches on this timer
+LOG_DRAIN_MS = 100
+# At most this many queued messages are written per tick, so a flood can't stall the UI
+LOG_BATCH = 2000
+# Oldest lines are dropped beyond this many
+MAX_LOG_LINES = 5000
+# Queued instead of a message to empty the log widget, so it stays ordered with the lines
+_CLEAR_LOG = object()
+
 class AuditorApp:
     def __init__(self, root):
         self.root = root
@@ -43,8 +57,29 @@ class AuditorApp:
         
         self.chi_path_var = tk.StringVar()
         self.eng_path_var = tk.StringVar()
+        # Re-running after editing one file only re-parses that file
+        self.section_cache = SectionCache()
+        # ...and only re-renders the report sections whose content changed (a ReportMemo, made on first run)
+        self.report_memo = None
+        # side ("chi"/"eng") -> (path, thread, log lines, CancelToken) of the background parse started on pick
+        self.prewarm_jobs = {}
+        # Guards prewarm_jobs: the Tk thread adds/cancels jobs while the audit thread waits on them
+        self.prewarm_lock = threading.Lock()
+        # Messages for the log widget, written by drain_log
+        self.log_queue = queue.SimpleQueue()
+        # CancelToken of the running audit, None when idle
+        self.cancel_token = None
 
         self.setup_ui()
+        # Import the engine while the user is still choosing files
+        threading.Thread(target=self.warm_up_engine, daemon=True).start()
+
+    def warm_up_engine(self):
+        try:
+            from check_docx_engine import warm_up
+            warm_up()
+        except Exception:
+            pass  # The audit itself will report the problem
 
     def setup_ui(self):
         main_container = ttk.Frame(self.root, padding=30)
@@ -99,9 +134,27 @@ class AuditorApp:
             padding=10
         )
         self.btn_run.pack(side=LEFT, padx=(0, 15))
+
+        self.btn_cancel = ttk.Button(
+            action_frame,
+            text="Cancel",
+            command=self.cancel_process,
+            bootstyle="danger-outline",
+            state="disabled",
+            padding=10
+        )
+        self.btn_cancel.pack(side=LEFT, padx=(0, 15))
         
         ttk.Button(action_frame, text="Exit Application", command=self.root.quit, bootstyle="secondary-outline", padding=10).pack(side=LEFT)
 
+        # Progress
+        progress_frame = ttk.Frame(main_container)
+        progress_frame.pack(fill=X, pady=(0, 10))
+        self.progress_label = ttk.Label(progress_frame, text="", width=28, bootstyle=SECONDARY)
+        self.progress_label.pack(side=LEFT)
+        self.progress_bar = ttk.Progressbar(progress_frame, maximum=100, bootstyle="success-striped")
+        self.progress_bar.pack(side=LEFT, fill=X, expand=YES)
+
         # Log Area
         log_label = ttk.Label(main_container, text="Execution Log:", font=("Helvetica", 10, "bold"), bootstyle=SECONDARY)
         log_label.pack(fill=X, pady=(10, 5))
@@ -118,41 +171,175 @@ class AuditorApp:
             highlightbackground="#dee2e6"
         )
         self.log_text.pack(fill=BOTH, expand=YES)
+        self.log_text.tag_config("error", foreground="#dc3545")
+        self.log_text.tag_config("warning", foreground="#ffc107")
+        self.log_text.tag_config("highlight", foreground="#0d6efd", font=("Consolas", 10, "bold"))
+
+        self.root.after(LOG_DRAIN_MS, self.drain_log)
 
     def log(self, message, level="info"):
-        """Write message to GUI log area"""
-        self.log_text.config(state='normal')
-        
-        tag_name = "normal"
+        """Queue message for the GUI log area. Safe to call from any thread."""
+        self.log_queue.put((message, level))
+
+    def clear_log(self):
+        self.log_queue.put(_CLEAR_LOG)
+
+    @staticmethod
+    def log_tag(message, level):
         if "Error" in message or level == "error":
-            tag_name = "error"
-            self.log_text.tag_config("error", foreground="#dc3545")
-        elif "Warning" in message:
-             tag_name = "warning"
-             self.log_text.tag_config("warning", foreground="#ffc107")
-        elif ">>>" in message or "Success" in message:
-             tag_name = "highlight"
-             self.log_text.tag_config("highlight", foreground="#0d6efd", font=("Consolas", 10, "bold"))
-
-        self.log_text.insert(tk.END, message + "\n", tag_name)
-        self.log_text.see(tk.END)
-        self.log_text.config(state='disabled')
+            return "error"
+        if "Warning" in message:
+            return "warning"
+        if ">>>" in message or "Success" in message:
+            return "highlight"
+        return "normal"
+
+    def drain_log(self):
+        """Timer callback: write queued messages to the widget in one batch, then trim it."""
+        chunks = []  # insert() arguments: text, tag, text, tag, ...
+        clear = False
+        for _ in range(LOG_BATCH):
+            try:
+                entry = self.log_queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is _CLEAR_LOG:
+                chunks, clear = [], True
+                continue
+            message, level = entry
+            tag_name = self.log_tag(message, level)
+            if chunks and chunks[-1] == tag_name:
+                chunks[-2] += message + "\n"  # Same tag as the previous line: one insert
+            else:
+                chunks += [message + "\n", tag_name]
+
+        if chunks or clear:
+            self.log_text.config(state='normal')
+            if clear:
+                self.log_text.delete(1.0, tk.END)
+            if chunks:
+                self.log_text.insert(tk.END, *chunks)
+                # Every message ends in a newline, so the last (empty) line is not counted
+                excess = int(self.log_text.index("end-1c").split(".")[0]) - 1 - MAX_LOG_LINES
+                if excess > 0:
+                    self.log_text.delete(1.0, f"{excess + 1}.0")
+                self.log_text.see(tk.END)
+            self.log_text.config(state='disabled')
+        self.root.after(1 if self.log_queue.qsize() else LOG_DRAIN_MS, self.drain_log)
+
+    # Engine phase -> (start, width) of its share of the progress bar in percent, label
+    PROGRESS_PHASES = {
+        "parse": (0, 80, "Parsing documents"),
+        "report": (80, 20, "Generating report"),
+    }
+
+    def show_progress(self, phase, fraction):
+        """Engine progress callback target; runs on the Tk thread."""
+        start, width, label = self.PROGRESS_PHASES.get(phase, (0, 0, ""))
+        self.progress_bar.config(value=start + width * fraction)
+        self.progress_label.config(text=f"{label}... {fraction:.0%}" if label else "")
 
     def select_chi_file(self):
         filename = filedialog.askopenfilename(filetypes=[("Word Documents", "*.docx")])
         if filename:
             self.chi_path_var.set(filename)
             self.log(f"Selected CH file: {os.path.basename(filename)}")
+            self.prewarm_document("chi", filename)
 
     def select_eng_file(self):
         filename = filedialog.askopenfilename(filetypes=[("Word Documents", "*.docx")])
         if filename:
             self.eng_path_var.set(filename)
             self.log(f"Selected EN file: {os.path.basename(filename)}")
+            self.prewarm_document("eng", filename)
+
+    def prewarm_document(self, side, path):
+        """
+        Parse a just-picked document into the section cache in the background, so the
+        audit usually finds both documents already parsed. Its log lines and scan
+        progress are kept for wait_for_prewarm to pass on when the audit runs.
+        """
+        logs = []
+        scan_fraction = [0.0]  # Updated by the (rate-limited) engine progress callback
+        from check_docx_engine import CancelToken
+        cancel = CancelToken()
+
+        def on_progress(phase, fraction):
+            if phase == "scan":
+                scan_fraction[0] = fraction
+
+        def work():
+            try:
+                from check_docx_engine import (
+                    CHI_TITLE_PATTERN, CHI_TOC_KEYWORD, ENG_TITLE_PATTERN, ENG_TOC_KEYWORD, parse_document_sections,
+                )
+                if side == "chi":
+                    keyword, pattern = CHI_TOC_KEYWORD, CHI_TITLE_PATTERN
+                else:
+                    keyword, pattern = ENG_TOC_KEYWORD, ENG_TITLE_PATTERN
+                parse_document_sections(
+                    path, keyword, pattern, logs.append, cache=self.section_cache, cancel=cancel,
+                    progress=on_progress)
+            except Exception:
+                pass  # Parsed again (and reported) by the audit
+
+        thread = threading.Thread(target=work, daemon=True)
+        job = (path, thread, logs, cancel, scan_fraction)
+        with self.prewarm_lock:
+            previous = self.prewarm_jobs.get(side)
+            self.prewarm_jobs[side] = job
+        if previous is not None:
+            previous[3].cancel()  # A file picked earlier for this side is no longer needed
+        thread.start()
+
+    def wait_for_prewarm(self, chi_path, eng_path, log_func, cancel, progress=None):
+        """
+        Let background parses of the chosen files finish (they fill the cache). Their log
+        lines are passed to log_func as they come, Chinese first, and progress("parse",
+        fraction) gets the mean scan progress of both sides while waiting.
+        """
+        jobs = {}
+        with self.prewarm_lock:
+            for side, path in (("chi", chi_path), ("eng", eng_path)):
+                job = self.prewarm_jobs.get(side)
+                if job is not None and job[0] == path:
+                    jobs[side] = job
+
+        def report(side, sent):
+            """Forward side's new log lines and the overall progress; returns the lines sent so far."""
+            lines = jobs[side][2][sent:]
+            for line in lines:
+                log_func(line)
+            if progress is not None:
+                progress("parse", sum(job[4][0] for job in jobs.values()) / 2)
+            return sent + len(lines)
+
+        for side, job in jobs.items():
+            thread = job[1]
+            sent = 0
+            while thread.is_alive():
+                cancel.check()
+                sent = report(side, sent)
+                thread.join(0.1)
+            report(side, sent)
+            with self.prewarm_lock:
+                # The side may have been re-picked meanwhile; that newer job stays
+                if self.prewarm_jobs.get(side) is job:
+                    del self.prewarm_jobs[side]
 
     def start_process(self):
         threading.Thread(target=self.run_logic, daemon=True).start()
 
+    def cancel_process(self):
+        if self.cancel_token is not None:
+            self.cancel_token.cancel()
+            with self.prewarm_lock:
+                jobs = list(self.prewarm_jobs.values())
+            for job in jobs:
+                job[3].cancel()
+            self.btn_cancel.config(state="disabled")
+            self.log("Cancelling...", "error")
+
     def run_logic(self):
         chi_path = self.chi_path_var.get()
         eng_path = self.eng_path_var.get()
@@ -161,55 +348,77 @@ class AuditorApp:
             self.root.after(0, lambda: messagebox.showwarning("Action Required", "Please select both Chinese and English documents first."))
             return
 
+        try:
+            from check_docx_engine import (
+                AuditCancelled, CancelToken, ReportMemo, generate_html_report, parse_document_pair,
+            )
+        except ImportError as e:
+            self.root.after(0, lambda: messagebox.showerror("Error", f"Could not load the audit engine:\n{e}"))
+            return
+        cancel = self.cancel_token = CancelToken()
+
         self.root.after(0, lambda: self.btn_run.config(state="disabled", text="Analyzing... Please Wait"))
+        self.root.after(0, lambda: self.btn_cancel.config(state="normal"))
         
-        def clear_log():
-            self.log_text.config(state='normal')
-            self.log_text.delete(1.0, tk.END)
-            self.log_text.config(state='disabled')
-        self.root.after(0, clear_log)
+        self.clear_log()
 
-        self.root.after(0, lambda: self.log(f">>> Starting Bilingual Audit Process (v{APP_VERSION})...", "highlight"))
-        self.root.after(0, lambda: self.log("-" * 50))
+        self.log(f">>> Starting Bilingual Audit Process (v{APP_VERSION})...", "highlight")
+        self.log("-" * 50)
 
         try:
-            # log_func wrapper for thread safety
-            def thread_safe_log(msg):
-                self.root.after(0, lambda: self.log(msg))
-
-            # 1. Extract
-            self.root.after(0, lambda: self.log(f"Reading Chinese Doc: {os.path.basename(chi_path)}"))
-            chi_pattern = r"^[甲乙丙丁戊己庚辛壬癸(（].*部\s*[：:]"
+            # 1. Extract (both documents in parallel worker processes)
+            self.log(f"Reading Chinese Doc: {os.path.basename(chi_path)}")
+            self.log(f"Reading English Doc: {os.path.basename(eng_path)}")
             
-            sections_chi = parse_document_sections(chi_path, "頁碼", chi_pattern, thread_safe_log)
+            # Engine callbacks are already rate-limited, so each one can go through root.after
+            def thread_safe_progress(phase, fraction):
+                self.root.after(0, lambda: self.show_progress(phase, fraction))
 
-            self.root.after(0, lambda: self.log(f"Reading English Doc: {os.path.basename(eng_path)}"))
-            eng_pattern = r"^Part.*[：:]"
-            
-            sections_eng = parse_document_sections(eng_path, "Page", eng_pattern, thread_safe_log)
+            self.root.after(0, lambda: self.show_progress("parse", 0.0))
+            self.wait_for_prewarm(chi_path, eng_path, self.log, cancel, thread_safe_progress)
+            stats = AuditStats()
+            sections_chi, sections_eng = parse_document_pair(
+                chi_path, eng_path, log_func=self.log, cache=self.section_cache, stats=stats, cancel=cancel,
+                progress=thread_safe_progress
+            )
 
             # 2. Generate Report
             output_dir = os.path.dirname(chi_path)
             output_path = os.path.join(output_dir, "Bilingual_Audit_Report.html")
             
-            self.root.after(0, lambda: self.log("-" * 50))
-            self.root.after(0, lambda: self.log(f"Generating HTML Report...", "highlight"))
+            self.log("-" * 50)
+            self.log(f"Generating HTML Report...", "highlight")
             
-            generate_html_report(sections_chi, sections_eng, output_path)
+            if self.report_memo is None:
+                self.report_memo = ReportMemo()
+            memo = self.report_memo
+            generate_html_report(sections_chi, sections_eng, output_path, stats, memo, cancel, thread_safe_progress)
+            if memo.reused:
+                self.log(f"Reused {memo.reused} of {memo.reused + memo.rendered} sections from the previous run.")
 
-            self.root.after(0, lambda: self.log("✅ SUCCESS! Report generated successfully.", "highlight"))
-            self.root.after(0, lambda: self.log(f"Location: {output_path}"))
+            self.log("✅ SUCCESS! Report generated successfully.", "highlight")
+            self.log(f"Location: {output_path}")
+            for line in stats.format_table():
+                self.log(line)
             
             self.root.after(0, lambda: messagebox.showinfo("Success", f"Audit complete!\n\nReport saved to:\n{output_path}"))
 
+        except AuditCancelled:
+            self.log("Audit cancelled.", "error")
+            self.root.after(0, lambda: self.show_progress(None, 0.0))
+
         except Exception as e:
-            self.root.after(0, lambda: self.log(f"❌ Critical Error: {str(e)}", "error"))
+            self.log(f"❌ Critical Error: {str(e)}", "error")
             self.root.after(0, lambda: messagebox.showerror("Error", f"An error occurred:\n{str(e)}"))
         
         finally:
+            self.cancel_token = None
+            self.root.after(0, lambda: self.btn_cancel.config(state="disabled"))
             self.root.after(0, lambda: self.btn_run.config(state="normal", text="🚀 Start Audit Analysis"))
 
 if __name__ == "__main__":
+    # Required for the parse worker processes in the PyInstaller build
+    multiprocessing.freeze_support()
     root = ttk.Window(themename="litera")
     app = AuditorApp(root)
     root.mainloop()
\ No newline at end of file